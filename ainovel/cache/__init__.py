@@ -0,0 +1,26 @@
+"""
+缓存模块
+
+提供 LLM 调用结果的内容哈希缓存，避免对未变更输入重复计费调用
+"""
+from ainovel.cache.llm_cache import (
+    LLMCacheEntry,
+    QUALITY_CHECK_PROMPT_VERSION,
+    DETAIL_OUTLINE_PROMPT_VERSION,
+    ANALYSIS_PROMPT_VERSION,
+    make_quality_check_key,
+    make_prompt_key,
+    get_cached_response,
+    put_cached_response,
+)
+
+__all__ = [
+    "LLMCacheEntry",
+    "QUALITY_CHECK_PROMPT_VERSION",
+    "DETAIL_OUTLINE_PROMPT_VERSION",
+    "ANALYSIS_PROMPT_VERSION",
+    "make_quality_check_key",
+    "make_prompt_key",
+    "get_cached_response",
+    "put_cached_response",
+]
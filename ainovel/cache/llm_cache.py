@@ -0,0 +1,135 @@
+"""
+LLM 结果缓存
+
+按输入内容哈希缓存 LLM 调用结果。迭代编辑场景下，
+章节内容/角色信息/前情回顾未变更时重复批量质检是常态，
+命中缓存可直接返回上次的质量报告，省去一次计费调用。
+
+缓存键为 (章节内容 | 角色信息 | 前情回顾 | 提示词版本) 的 SHA-256 摘要；
+提示词模板变更时递增对应的 PROMPT_VERSION 使旧缓存自然失效。
+"""
+import hashlib
+from typing import Dict, Any, Optional, List
+
+import orjson
+from sqlalchemy import String, Text, Integer
+from sqlalchemy.orm import Mapped, mapped_column, Session
+
+from ainovel.db.base import Base, TimestampMixin
+
+# 质检提示词版本：QUALITY_CHECK_RUBRIC/INPUT 模板变更时递增
+QUALITY_CHECK_PROMPT_VERSION = 1
+
+# 细纲提示词版本：DETAIL_OUTLINE 模板变更时递增
+DETAIL_OUTLINE_PROMPT_VERSION = 2
+
+# 专项分析提示词版本：各 *_ANALYSIS/CHECK 模板变更时递增
+# v2: 模板重排为静态评分标准在前、动态内容在后（提供商提示词缓存）
+ANALYSIS_PROMPT_VERSION = 2
+
+
+class LLMCacheEntry(Base, TimestampMixin):
+    """
+    LLM 调用结果缓存条目
+
+    key 为输入内容的 SHA-256 摘要，response_json 为序列化的结果字典
+    """
+    __tablename__ = "llm_cache"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True, comment="输入内容摘要")
+    prompt_version: Mapped[int] = mapped_column(Integer, nullable=False, comment="提示词版本")
+    response_json: Mapped[str] = mapped_column(Text, nullable=False, comment="缓存的结果JSON")
+
+    def __repr__(self) -> str:
+        return f"LLMCacheEntry(key={self.key[:12]}..., prompt_version={self.prompt_version})"
+
+
+def make_quality_check_key(
+    chapter_content: str,
+    character_list: List[Dict[str, Any]],
+    previous_context: str,
+    prompt_version: int = QUALITY_CHECK_PROMPT_VERSION,
+) -> str:
+    """
+    计算质检输入的缓存键
+
+    Args:
+        chapter_content: 章节正文
+        character_list: 涉及角色信息
+        previous_context: 前情回顾
+        prompt_version: 提示词版本
+
+    Returns:
+        SHA-256 十六进制摘要
+    """
+    digest = hashlib.sha256()
+    digest.update(chapter_content.encode("utf-8"))
+    digest.update(b"|")
+    digest.update(orjson.dumps(character_list, option=orjson.OPT_SORT_KEYS))
+    digest.update(b"|")
+    digest.update(previous_context.encode("utf-8"))
+    digest.update(b"|")
+    digest.update(str(prompt_version).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def make_prompt_key(prompt: str, model: str, prompt_version: int) -> str:
+    """
+    按完整提示词计算缓存键（提示词已包含全部动态输入）
+
+    Args:
+        prompt: 最终发送给 LLM 的提示词
+        model: 模型名称（不同模型输出不可互换）
+        prompt_version: 提示词版本
+
+    Returns:
+        SHA-256 十六进制摘要
+    """
+    digest = hashlib.sha256()
+    digest.update(prompt.encode("utf-8"))
+    digest.update(b"|")
+    digest.update(model.encode("utf-8"))
+    digest.update(b"|")
+    digest.update(str(prompt_version).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def get_cached_response(session: Session, key: str) -> Optional[Dict[str, Any]]:
+    """
+    查询缓存，命中返回反序列化后的结果字典，未命中返回 None
+    """
+    entry = session.get(LLMCacheEntry, key)
+    if entry is None:
+        return None
+    try:
+        return orjson.loads(entry.response_json)
+    except orjson.JSONDecodeError:
+        return None
+
+
+def put_cached_response(
+    session: Session,
+    key: str,
+    value: Dict[str, Any],
+    prompt_version: int = QUALITY_CHECK_PROMPT_VERSION,
+    commit: bool = True,
+) -> None:
+    """
+    写入缓存（已存在时覆盖）
+
+    commit=False 时只 flush 不提交，供批量共享会话的调用方
+    把缓存写入并入批末尾的统一 commit
+    """
+    entry = session.get(LLMCacheEntry, key)
+    response_json = orjson.dumps(value).decode()
+    if entry is None:
+        session.add(
+            LLMCacheEntry(key=key, prompt_version=prompt_version, response_json=response_json)
+        )
+    else:
+        entry.prompt_version = prompt_version
+        entry.response_json = response_json
+    if commit:
+        session.commit()
+    else:
+        session.flush()
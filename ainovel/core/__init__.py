@@ -3,7 +3,7 @@
 
 提供提示词管理、大纲生成、章节生成和上下文压缩功能
 """
-from ainovel.core.prompt_manager import PromptManager
+from ainovel.core.prompt_manager import PromptManager, get_prompt_manager
 from ainovel.core.outline_generator import OutlineGenerator
 from ainovel.core.chapter_generator import ChapterGenerator
 from ainovel.core.chapter_rewriter import ChapterRewriter
@@ -11,6 +11,7 @@ from ainovel.core.context_compressor import ContextCompressor, CompressionLevel
 
 __all__ = [
     "PromptManager",
+    "get_prompt_manager",
     "OutlineGenerator",
     "ChapterGenerator",
     "ChapterRewriter",
@@ -3,12 +3,12 @@
 
 根据大纲和前文生成具体的章节内容
 """
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 from sqlalchemy.orm import Session
 from loguru import logger
 
 from ainovel.llm import BaseLLMClient
-from ainovel.core.prompt_manager import PromptManager
+from ainovel.core.prompt_manager import get_prompt_manager
 from ainovel.core.context_compressor import ContextCompressor
 from ainovel.db import novel_crud, volume_crud, chapter_crud
 from ainovel.memory import CharacterDatabase, WorldDatabase
@@ -27,7 +27,7 @@ class ChapterGenerator:
         """
         self.llm_client = llm_client
         self.session = session
-        self.prompt_manager = PromptManager()
+        self.prompt_manager = get_prompt_manager()
         self.character_db = CharacterDatabase(session)
         self.world_db = WorldDatabase(session)
         self.context_compressor = ContextCompressor(llm_client, session)
@@ -43,6 +43,7 @@ class ChapterGenerator:
         max_tokens: int = 4000,
         use_previous_context: bool = True,
         context_window_size: int = 3,
+        on_delta: Optional[Callable[[str], None]] = None,
     ) -> Dict[str, Any]:
         """
         生成章节内容
@@ -57,6 +58,8 @@ class ChapterGenerator:
             max_tokens: 最大生成token数
             use_previous_context: 是否使用前文上下文
             context_window_size: 上下文窗口大小（前N章）
+            on_delta: 流式增量回调；提供时走 generate_stream，
+                文本片段一到达即回调，首字延迟与最终篇幅无关
 
         Returns:
             生成结果，包含章节内容和token使用情况
@@ -144,11 +147,19 @@ class ChapterGenerator:
         messages = [{"role": "user", "content": prompt}]
 
         try:
-            response = self.llm_client.generate(
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-            )
+            if on_delta is not None:
+                response = self.llm_client.generate_stream(
+                    messages=messages,
+                    on_delta=on_delta,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                )
+            else:
+                response = self.llm_client.generate(
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                )
 
             content = response["content"]
             usage = response["usage"]
@@ -208,6 +219,7 @@ class ChapterGenerator:
         word_count_max: int = 3000,
         temperature: float = 0.8,
         max_tokens: int = 4000,
+        on_delta: Optional[Callable[[str], None]] = None,
     ) -> Dict[str, Any]:
         """
         生成并保存章节内容（一步完成）
@@ -220,6 +232,7 @@ class ChapterGenerator:
             word_count_max: 最大字数
             temperature: LLM温度参数
             max_tokens: 最大生成token数
+            on_delta: 流式增量回调；入库仍在生成完整后一次完成
 
         Returns:
             包含章节内容、保存统计和token使用情况的结果
@@ -232,6 +245,7 @@ class ChapterGenerator:
             word_count_max=word_count_max,
             temperature=temperature,
             max_tokens=max_tokens,
+            on_delta=on_delta,
         )
 
         stats = self.save_chapter_content(chapter_id, result["content"])
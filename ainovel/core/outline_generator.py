@@ -10,7 +10,7 @@ from sqlalchemy.orm import Session
 from loguru import logger
 
 from ainovel.llm import BaseLLMClient
-from ainovel.core.prompt_manager import PromptManager
+from ainovel.core.prompt_manager import get_prompt_manager
 from ainovel.db import novel_crud, volume_crud, chapter_crud
 from ainovel.db.novel import Novel
 from ainovel.memory import CharacterDatabase, WorldDatabase
@@ -30,7 +30,7 @@ class OutlineGenerator:
         """
         self.llm_client = llm_client
         self.session = session
-        self.prompt_manager = PromptManager()
+        self.prompt_manager = get_prompt_manager()
         self.character_db = CharacterDatabase(session)
         self.world_db = WorldDatabase(session)
 
@@ -3,6 +3,7 @@
 
 提供大纲生成和章节生成所需的提示词模板
 """
+from functools import lru_cache
 from typing import Dict, List, Any
 
 
@@ -145,28 +146,10 @@ class PromptManager:
     #   - Autonomous Literary Creation Engine：Scene Architecture——setting/character interactions/plot advancement/emotional beats/pacing
     #   - 场景目标-冲突-结局（Goal-Conflict-Outcome）：每个场景须有明确目标，遭遇阻力，产生结果
     #   - 场景-续集结构（Scene-Sequel）：动作场景后须有反应场景（情绪处理→思考→决策）
-    DETAIL_OUTLINE_PROMPT = """你是一位细纲编写专家，精通场景架构与叙事节奏控制。
-请根据已有的大纲，为指定章节生成详细的场景细纲。
-
-## 小说基本信息
-- 标题: {title}
-- 当前分卷: {volume_title}
-- 当前章节: 第{chapter_order}章 - {chapter_title}
-
-## 章节梗概（来自大纲）
-{chapter_summary}
-
-## 本章重点事件
-{key_events}
-
-## 涉及角色
-{character_info}
-
-## 世界观背景
-{world_info}
-
-## 前情回顾
-{previous_context}
+    # 细纲生成静态前缀：设计原则与输出格式全部前置且字节恒定，
+    # 便于 LLM 提供商按前缀缓存（显式 cache_control 或自动 prefix cache）
+    DETAIL_OUTLINE_RUBRIC = """你是一位细纲编写专家，精通场景架构与叙事节奏控制。
+请根据随后提供的大纲信息，为指定章节生成详细的场景细纲。
 
 ## 场景设计原则
 
@@ -191,12 +174,12 @@ class PromptManager:
 
 ## 输出格式（JSON）
 ```json
-{{
+{
   "chapter_goal": "本章对主角的核心考验或推进",
   "emotional_arc": "本章整体情绪弧线（如：期待→受挫→绝望→转机）",
   "cliffhanger": "章末悬念",
   "scenes": [
-    {{
+    {
       "scene_number": 1,
       "scene_type": "action/sequel/transition",
       "location": "场景地点",
@@ -211,10 +194,37 @@ class PromptManager:
       "emotional_shift": "情绪变化（如：+紧张/-希望）",
       "foreshadowing": "伏笔（如有）",
       "estimated_words": 600
-    }}
+    }
   ]
-}}
+}
 ```
+"""
+
+    # 细纲生成动态输入：全部可变字段置于提示词末尾；
+    # 小说级字段（标题/世界观）在前、逐章字段在后，
+    # 批量生成同一小说时可变前缀亦尽量字节稳定
+    DETAIL_OUTLINE_INPUT = """
+## 小说基本信息
+- 标题: {title}
+
+## 世界观背景
+{world_info}
+
+## 当前章节
+- 所属分卷: {volume_title}
+- 章节: 第{chapter_order}章 - {chapter_title}
+
+## 章节梗概（来自大纲）
+{chapter_summary}
+
+## 本章重点事件
+{key_events}
+
+## 涉及角色
+{character_info}
+
+## 前情回顾
+{previous_context}
 """
 
     # 大纲生成提示词模板
@@ -529,25 +539,10 @@ class PromptManager:
     #   - Autonomous Literary Creation Engine：Editorial Assessment——dialogue authenticity/pacing/character consistency/plot logic/prose quality
     #   - scarletink实践：AI最易出现连续性问题（continuity errors）和人格漂移，须重点检查
     #   - 叙事张力理论：每章须有进入张力和离开张力，避免"平章"
-    QUALITY_CHECK_PROMPT = """你是一位专业的小说编辑，精通叙事结构与角色心理学。
-请对以下章节内容进行全面的质量检查，从9个维度评估并给出可执行的修改建议。
-
-## 小说基本信息
-- 标题: {title}
-- 当前分卷: {volume_title}
-- 当前章节: 第{chapter_order}章 - {chapter_title}
-
-## 章节梗概
-{chapter_summary}
-
-## 涉及角色
-{character_info}
-
-## 前情回顾
-{previous_context}
-
-## 待检查的章节内容
-{chapter_content}
+    # 质量检查静态前缀：规则与输出格式全部前置且字节恒定，
+    # 便于 LLM 提供商按前缀缓存（显式 cache_control 或自动 prefix cache）
+    QUALITY_CHECK_RUBRIC = """你是一位专业的小说编辑，精通叙事结构与角色心理学。
+请对随后提供的章节内容进行全面的质量检查，从9个维度评估并给出可执行的修改建议。
 
 ## 检查维度
 
@@ -572,9 +567,9 @@ class PromptManager:
 
 ## 输出格式（JSON）
 ```json
-{{
+{
   "overall_score": 85,
-  "dimension_scores": {{
+  "dimension_scores": {
     "情节连贯性": 90,
     "角色一致性": 85,
     "世界观自洽": 95,
@@ -590,22 +585,43 @@ class PromptManager:
     "人物行为法则": 85,
     "节奏法则": 80,
     "感官法则": 75
-  }},
+  },
   "issues": [
-    {{
+    {
       "severity": "critical/major/minor",
       "dimension": "检查维度名称",
       "location": "问题位置（如：第3段，对话部分）",
       "description": "问题描述",
       "suggestion": "具体修改建议（可操作，非空泛评价）"
-    }}
+    }
   ],
   "highlights": ["亮点1", "亮点2"],
   "summary": "总体评价（100字以内）"
-}}
+}
 ```
 """
 
+    # 质量检查动态输入：全部可变字段置于提示词末尾
+    QUALITY_CHECK_INPUT = """
+## 小说基本信息
+- 标题: {title}
+- 当前分卷: {volume_title}
+- 当前章节: 第{chapter_order}章 - {chapter_title}
+
+## 章节梗概
+{chapter_summary}
+
+## 涉及角色
+{character_info}
+
+## 前情回顾
+{previous_context}
+
+## 待检查的章节内容
+{chapter_content}
+"""
+
+
     # 文风分析提示词模板
     STYLE_ANALYSIS_PROMPT = """你是一位专业的文学风格分析师。请深度分析以下参考文本的写作风格，提取可复用的风格特征。
 
@@ -743,29 +759,32 @@ class PromptManager:
                 [f"{k}: {v}/10" for k, v in personality_traits.items()]
             )
 
-            section = f"""### {name} ({mbti})
-**背景**: {background}
-**性格特征**: {traits_str if traits_str else "未设定"}"""
+            # 逐行收集后一次 join，避免可选字段多时的反复字符串拼接
+            lines = [
+                f"### {name} ({mbti})",
+                f"**背景**: {background}",
+                f"**性格特征**: {traits_str if traits_str else '未设定'}",
+            ]
 
             # 添加目标（如果有）
             goals = char.get("goals")
             if goals:
-                section += f"\n**当前目标**: {goals}"
+                lines.append(f"**当前目标**: {goals}")
 
             # 添加当前状态（如果有）
             current_status = char.get("current_status")
             if current_status:
-                section += f"\n**当前状态**: {current_status}"
+                lines.append(f"**当前状态**: {current_status}")
 
             # 添加当前心情（如果有）
             current_mood = char.get("current_mood")
             if current_mood:
-                section += f"\n**当前心情**: {current_mood}"
+                lines.append(f"**当前心情**: {current_mood}")
 
             # 添加口头禅（如果有）
             catchphrases = char.get("catchphrases") or []
             if catchphrases:
-                section += f"\n**口头禅**: {' / '.join(catchphrases)}"
+                lines.append(f"**口头禅**: {' / '.join(catchphrases)}")
 
             # 添加记忆信息（如果有）
             memories = char.get("memories", [])
@@ -774,9 +793,9 @@ class PromptManager:
                     m["content"] for m in memories if m.get("importance") == "high"
                 ]
                 if important_memories:
-                    section += f"\n**重要经历**: {'; '.join(important_memories[:3])}"
+                    lines.append(f"**重要经历**: {'; '.join(important_memories[:3])}")
 
-            sections.append(section)
+            sections.append("\n".join(lines))
 
         return "\n\n".join(sections)
 
@@ -1084,7 +1103,37 @@ class PromptManager:
         Returns:
             完整的提示词
         """
-        return cls.QUALITY_CHECK_PROMPT.format(
+        static_part, dynamic_part = cls.generate_quality_check_prompt_parts(
+            title=title,
+            volume_title=volume_title,
+            chapter_order=chapter_order,
+            chapter_title=chapter_title,
+            chapter_summary=chapter_summary,
+            chapter_content=chapter_content,
+            character_list=character_list,
+            previous_context=previous_context,
+        )
+        return static_part + dynamic_part
+
+    @classmethod
+    def generate_quality_check_prompt_parts(
+        cls,
+        title: str,
+        volume_title: str,
+        chapter_order: int,
+        chapter_title: str,
+        chapter_summary: str,
+        chapter_content: str,
+        character_list: List[Dict[str, Any]],
+        previous_context: str,
+    ) -> tuple:
+        """
+        生成质量检查提示词的 (静态前缀, 动态部分) 二元组
+
+        静态前缀为字节恒定的检查规则与输出格式，动态部分为逐章节可变内容；
+        分离后上层可对前缀启用提供商提示词缓存。
+        """
+        dynamic_part = cls.QUALITY_CHECK_INPUT.format(
             title=title,
             volume_title=volume_title,
             chapter_order=chapter_order,
@@ -1094,6 +1143,7 @@ class PromptManager:
             character_info=cls.format_character_info(character_list),
             previous_context=previous_context or "本章为开篇，无前情",
         )
+        return cls.QUALITY_CHECK_RUBRIC, dynamic_part
 
     @classmethod
     def generate_detail_outline_prompt(
@@ -1125,9 +1175,41 @@ class PromptManager:
         Returns:
             完整的提示词
         """
+        static_part, dynamic_part = cls.generate_detail_outline_prompt_parts(
+            title=title,
+            volume_title=volume_title,
+            chapter_order=chapter_order,
+            chapter_title=chapter_title,
+            chapter_summary=chapter_summary,
+            key_events=key_events,
+            character_list=character_list,
+            world_data_list=world_data_list,
+            previous_context=previous_context,
+        )
+        return static_part + dynamic_part
+
+    @classmethod
+    def generate_detail_outline_prompt_parts(
+        cls,
+        title: str,
+        volume_title: str,
+        chapter_order: int,
+        chapter_title: str,
+        chapter_summary: str,
+        key_events: List[str],
+        character_list: List[Dict[str, Any]],
+        world_data_list: List[Dict[str, Any]],
+        previous_context: str,
+    ) -> tuple:
+        """
+        生成细纲提示词的 (静态前缀, 动态部分) 二元组
+
+        静态前缀为字节恒定的设计原则与输出格式，动态部分为逐章节可变内容；
+        分离后上层可对前缀启用提供商提示词缓存。
+        """
         key_events_str = "\n".join([f"- {event}" for event in key_events])
 
-        return cls.DETAIL_OUTLINE_PROMPT.format(
+        dynamic_part = cls.DETAIL_OUTLINE_INPUT.format(
             title=title,
             volume_title=volume_title,
             chapter_order=chapter_order,
@@ -1138,6 +1220,7 @@ class PromptManager:
             world_info=cls.format_world_info(world_data_list),
             previous_context=previous_context or "本章为开篇，无前情",
         )
+        return cls.DETAIL_OUTLINE_RUBRIC, dynamic_part
 
     # ─────────────────────────────────────────────────────────────────────────
     # KB2 v5.0 融合：书名与简介生成（第十一步）
@@ -1200,14 +1283,10 @@ class PromptManager:
     # KB2 v5.0 融合：爽点专项分析（帮回系统）
     # 理论依据：第三法则爽感工程学 —— 高对比 + 高密度 + 高情绪
     # ─────────────────────────────────────────────────────────────────────────
-    SATISFACTION_ANALYSIS_PROMPT = """你是一位专业的商业网文分析师，精通爽感工程学。
-请对以下章节内容进行爽点专项分析，基于【第三法则：爽感工程学】给出量化报告。
-
-## 待分析内容
-章节范围：{chapter_range}
-章节总字数：约{total_words}字
-
-{chapters_content}
+    # 静态评分标准（无 .format 占位符，花括号不转义）：
+    # 字节恒定的前缀便于提供商提示词缓存命中
+    SATISFACTION_ANALYSIS_RUBRIC = """你是一位专业的商业网文分析师，精通爽感工程学。
+请对随后提供的章节内容进行爽点专项分析，基于【第三法则：爽感工程学】给出量化报告。
 
 ## 分析维度
 
@@ -1225,45 +1304,49 @@ class PromptManager:
 
 ## 输出格式（严格JSON）
 ```json
-{{
-  "statistics": {{
+{
+  "statistics": {
     "total_satisfaction_points": 0,
     "small_points": 0,
     "big_points": 0,
     "density_per_10k_words": 0.0,
-    "type_distribution": {{
+    "type_distribution": {
       "打脸爽": 0, "装逼爽": 0, "复仇爽": 0, "获得爽": 0,
       "逆袭爽": 0, "揭秘爽": 0, "升级爽": 0, "其他": 0
-    }}
-  }},
-  "quality_scores": {{
-    "high_contrast": {{"score": 0, "analysis": ""}},
-    "high_density": {{"score": 0, "analysis": ""}},
-    "high_emotion": {{"score": 0, "analysis": ""}},
+    }
+  },
+  "quality_scores": {
+    "high_contrast": {"score": 0, "analysis": ""},
+    "high_density": {"score": 0, "analysis": ""},
+    "high_emotion": {"score": 0, "analysis": ""},
     "total": 0
-  }},
+  },
   "issues": [
-    {{"description": "", "severity": "high|medium|low", "location": ""}}
+    {"description": "", "severity": "high|medium|low", "location": ""}
   ],
   "suggestions": [
-    {{"option": "A", "description": "", "expected_effect": ""}}
+    {"option": "A", "description": "", "expected_effect": ""}
   ],
   "recommended_action": ""
-}}
+}
 ```"""
 
-    # ─────────────────────────────────────────────────────────────────────────
-    # KB2 v5.0 融合：节奏专项分析（帮回系统）
-    # 理论依据：第五法则节奏控制 —— 快慢交替、张弛有度
-    # ─────────────────────────────────────────────────────────────────────────
-    RHYTHM_ANALYSIS_PROMPT = """你是一位专业的叙事节奏分析师，精通商业网文的节奏控制法则。
-请对以下章节内容进行节奏专项分析，基于【第五法则：节奏控制】给出量化报告。
+    # 专项分析动态输入：可变字段统一置于提示词末尾
+    # （爽点/节奏/冲突三类分析共用同一输入形态）
+    ANALYSIS_CONTENT_INPUT = """
 
 ## 待分析内容
 章节范围：{chapter_range}
 章节总字数：约{total_words}字
 
-{chapters_content}
+{chapters_content}"""
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # KB2 v5.0 融合：节奏专项分析（帮回系统）
+    # 理论依据：第五法则节奏控制 —— 快慢交替、张弛有度
+    # ─────────────────────────────────────────────────────────────────────────
+    RHYTHM_ANALYSIS_RUBRIC = """你是一位专业的叙事节奏分析师，精通商业网文的节奏控制法则。
+请对随后提供的章节内容进行节奏专项分析，基于【第五法则：节奏控制】给出量化报告。
 
 ## 分析维度
 
@@ -1282,42 +1365,36 @@ class PromptManager:
 
 ## 输出格式（严格JSON）
 ```json
-{{
-  "distribution": {{
+{
+  "distribution": {
     "fast_chapters": [],
     "medium_chapters": [],
     "slow_chapters": [],
     "fast_ratio": 0.0,
     "medium_ratio": 0.0,
     "slow_ratio": 0.0
-  }},
-  "quality_scores": {{
-    "alternation": {{"score": 0, "analysis": ""}},
-    "climax_buildup": {{"score": 0, "analysis": ""}},
-    "transition": {{"score": 0, "analysis": ""}},
+  },
+  "quality_scores": {
+    "alternation": {"score": 0, "analysis": ""},
+    "climax_buildup": {"score": 0, "analysis": ""},
+    "transition": {"score": 0, "analysis": ""},
     "total": 0
-  }},
+  },
   "issues": [
-    {{"description": "", "severity": "high|medium|low", "location": ""}}
+    {"description": "", "severity": "high|medium|low", "location": ""}
   ],
   "suggestions": [
-    {{"description": "", "expected_effect": ""}}
+    {"description": "", "expected_effect": ""}
   ]
-}}
+}
 ```"""
 
     # ─────────────────────────────────────────────────────────────────────────
     # KB2 v5.0 融合：冲突专项分析（帮回系统）
     # 理论依据：第二法则冲突递增引擎 —— 四维升级 + 明暗双线 + 不完全胜利
     # ─────────────────────────────────────────────────────────────────────────
-    CONFLICT_ANALYSIS_PROMPT = """你是一位专业的叙事冲突分析师，精通商业网文的冲突设计法则。
-请对以下章节内容进行冲突专项分析，基于【第二法则：冲突递增引擎】给出量化报告。
-
-## 待分析内容
-章节范围：{chapter_range}
-章节总字数：约{total_words}字
-
-{chapters_content}
+    CONFLICT_ANALYSIS_RUBRIC = """你是一位专业的叙事冲突分析师，精通商业网文的冲突设计法则。
+请对随后提供的章节内容进行冲突专项分析，基于【第二法则：冲突递增引擎】给出量化报告。
 
 ## 分析维度
 
@@ -1339,47 +1416,39 @@ class PromptManager:
 
 ## 输出格式（严格JSON）
 ```json
-{{
-  "conflict_intensity": {{
+{
+  "conflict_intensity": {
     "main_line_trend": "ascending|flat|descending",
     "sub_line_trend": "ascending|flat|descending",
     "main_line_score": 0,
     "sub_line_score": 0
-  }},
-  "four_dimension_scores": {{
-    "power": {{"score": 0, "analysis": ""}},
-    "emotion": {{"score": 0, "analysis": ""}},
-    "scope": {{"score": 0, "analysis": ""}},
-    "urgency": {{"score": 0, "analysis": ""}},
+  },
+  "four_dimension_scores": {
+    "power": {"score": 0, "analysis": ""},
+    "emotion": {"score": 0, "analysis": ""},
+    "scope": {"score": 0, "analysis": ""},
+    "urgency": {"score": 0, "analysis": ""},
     "total": 0
-  }},
-  "incomplete_victory_check": {{
+  },
+  "incomplete_victory_check": {
     "passed": true,
     "violations": []
-  }},
+  },
   "issues": [
-    {{"description": "", "severity": "high|medium|low"}}
+    {"description": "", "severity": "high|medium|low"}
   ],
   "suggestions": [
-    {{"description": "", "expected_effect": ""}}
+    {"description": "", "expected_effect": ""}
   ]
-}}
+}
 ```"""
 
     # ─────────────────────────────────────────────────────────────────────────
     # KB2 v5.0 融合：人设专项检查（帮回系统）
     # 理论依据：第四法则人物基因锚定 —— 三层人格 + 行为一致性 + 成长弧光
     # ─────────────────────────────────────────────────────────────────────────
-    CHARACTER_CHECK_PROMPT = """你是一位专业的角色一致性审校员，精通人物心理学和叙事人设管理。
-请对指定角色进行全文人设专项检查，基于【第四法则：人物基因锚定理论】给出量化报告。
-
-## 待检查角色
-角色名：{character_name}
-角色档案：
-{character_profile}
-
-## 待检查内容（涉及该角色的所有章节）
-{chapters_content}
+    CHARACTER_CHECK_RUBRIC = """你是一位专业的角色一致性审校员，精通人物心理学和叙事人设管理。
+请对随后指定的角色进行全文人设专项检查，基于【第四法则：人物基因锚定理论】给出量化报告。
 
 ## 检查维度
 
@@ -1398,39 +1467,47 @@ class PromptManager:
 
 ## 输出格式（严格JSON）
 ```json
-{{
-  "consistency_scores": {{
-    "core_values": {{"score": 0, "analysis": ""}},
-    "behavior_pattern": {{"score": 0, "analysis": ""}},
-    "decision_logic": {{"score": 0, "analysis": ""}},
-    "speech_style": {{"score": 0, "analysis": ""}},
+{
+  "consistency_scores": {
+    "core_values": {"score": 0, "analysis": ""},
+    "behavior_pattern": {"score": 0, "analysis": ""},
+    "decision_logic": {"score": 0, "analysis": ""},
+    "speech_style": {"score": 0, "analysis": ""},
     "total": 0
-  }},
-  "growth_arc": {{
+  },
+  "growth_arc": {
     "start_state": "",
     "current_state": "",
     "trajectory": "",
     "is_reasonable": true,
     "reasoning": ""
-  }},
+  },
   "issues": [
-    {{"description": "", "location": "", "severity": "high|medium|low"}}
+    {"description": "", "location": "", "severity": "high|medium|low"}
   ],
   "suggestions": [
-    {{"description": ""}}
+    {"description": ""}
   ]
-}}
+}
 ```"""
 
+    # 人设检查动态输入：角色档案与涉及章节置于提示词末尾
+    CHARACTER_CHECK_INPUT = """
+
+## 待检查角色
+角色名：{character_name}
+角色档案：
+{character_profile}
+
+## 待检查内容（涉及该角色的所有章节）
+{chapters_content}"""
+
     # ─────────────────────────────────────────────────────────────────────────
     # KB2 v5.0 融合：开篇质量专项检查（黄金开篇五大铁律）
     # 理论依据：前3章是留存率最关键的区间，五大铁律决定读者是否继续阅读
     # ─────────────────────────────────────────────────────────────────────────
-    OPENING_CHECK_PROMPT = """你是一位专业的商业网文开篇质量审核员，精通读者留存心理学。
-请对小说前三章进行开篇专项检查，依据【黄金开篇五大铁律】给出逐项评估报告。
-
-## 待检查内容（前三章）
-{opening_chapters}
+    OPENING_CHECK_RUBRIC = """你是一位专业的商业网文开篇质量审核员，精通读者留存心理学。
+请对随后提供的小说前三章进行开篇专项检查，依据【黄金开篇五大铁律】给出逐项评估报告。
 
 ## 五大铁律检查
 
@@ -1461,52 +1538,58 @@ class PromptManager:
 
 ## 输出格式（严格JSON）
 ```json
-{{
-  "rules": {{
-    "dynamic_opening": {{
+{
+  "rules": {
+    "dynamic_opening": {
       "passed": true,
       "score": 0,
       "evidence": "引用原文关键句",
       "issue": "问题描述（如通过则为空）",
       "suggestion": "改进建议（如通过则为空）"
-    }},
-    "conflict_first": {{
+    },
+    "conflict_first": {
       "passed": true,
       "score": 0,
       "evidence": "",
       "issue": "",
       "suggestion": ""
-    }},
-    "no_info_dump": {{
+    },
+    "no_info_dump": {
       "passed": true,
       "score": 0,
       "evidence": "",
       "issue": "",
       "suggestion": ""
-    }},
-    "limited_characters": {{
+    },
+    "limited_characters": {
       "passed": true,
       "score": 0,
       "named_characters": [],
       "character_count": 0,
       "issue": "",
       "suggestion": ""
-    }},
-    "quick_power_reveal": {{
+    },
+    "quick_power_reveal": {
       "passed": true,
       "score": 0,
       "evidence": "",
       "issue": "",
       "suggestion": ""
-    }}
-  }},
+    }
+  },
   "overall_score": 0,
   "passed_count": 0,
   "summary": "总体评价（100字以内）",
   "priority_fixes": ["最优先修改项1", "最优先修改项2"]
-}}
+}
 ```"""
 
+    # 开篇检查动态输入：前三章正文置于提示词末尾
+    OPENING_CHECK_INPUT = """
+
+## 待检查内容（前三章）
+{opening_chapters}"""
+
     @classmethod
     def generate_title_synopsis_prompt(
         cls,
@@ -1535,7 +1618,22 @@ class PromptManager:
         chapters_content: str,
     ) -> str:
         """生成爽点专项分析提示词（KB2 帮回系统）"""
-        return cls.SATISFACTION_ANALYSIS_PROMPT.format(
+        static_part, dynamic_part = cls.generate_satisfaction_analysis_prompt_parts(
+            chapter_range=chapter_range,
+            total_words=total_words,
+            chapters_content=chapters_content,
+        )
+        return static_part + dynamic_part
+
+    @classmethod
+    def generate_satisfaction_analysis_prompt_parts(
+        cls,
+        chapter_range: str,
+        total_words: int,
+        chapters_content: str,
+    ) -> tuple:
+        """生成爽点专项分析提示词的 (静态评分标准, 动态输入) 二元组"""
+        return cls.SATISFACTION_ANALYSIS_RUBRIC, cls.ANALYSIS_CONTENT_INPUT.format(
             chapter_range=chapter_range,
             total_words=total_words,
             chapters_content=chapters_content,
@@ -1549,7 +1647,22 @@ class PromptManager:
         chapters_content: str,
     ) -> str:
         """生成节奏专项分析提示词（KB2 帮回系统）"""
-        return cls.RHYTHM_ANALYSIS_PROMPT.format(
+        static_part, dynamic_part = cls.generate_rhythm_analysis_prompt_parts(
+            chapter_range=chapter_range,
+            total_words=total_words,
+            chapters_content=chapters_content,
+        )
+        return static_part + dynamic_part
+
+    @classmethod
+    def generate_rhythm_analysis_prompt_parts(
+        cls,
+        chapter_range: str,
+        total_words: int,
+        chapters_content: str,
+    ) -> tuple:
+        """生成节奏专项分析提示词的 (静态评分标准, 动态输入) 二元组"""
+        return cls.RHYTHM_ANALYSIS_RUBRIC, cls.ANALYSIS_CONTENT_INPUT.format(
             chapter_range=chapter_range,
             total_words=total_words,
             chapters_content=chapters_content,
@@ -1563,7 +1676,22 @@ class PromptManager:
         chapters_content: str,
     ) -> str:
         """生成冲突专项分析提示词（KB2 帮回系统）"""
-        return cls.CONFLICT_ANALYSIS_PROMPT.format(
+        static_part, dynamic_part = cls.generate_conflict_analysis_prompt_parts(
+            chapter_range=chapter_range,
+            total_words=total_words,
+            chapters_content=chapters_content,
+        )
+        return static_part + dynamic_part
+
+    @classmethod
+    def generate_conflict_analysis_prompt_parts(
+        cls,
+        chapter_range: str,
+        total_words: int,
+        chapters_content: str,
+    ) -> tuple:
+        """生成冲突专项分析提示词的 (静态评分标准, 动态输入) 二元组"""
+        return cls.CONFLICT_ANALYSIS_RUBRIC, cls.ANALYSIS_CONTENT_INPUT.format(
             chapter_range=chapter_range,
             total_words=total_words,
             chapters_content=chapters_content,
@@ -1577,7 +1705,22 @@ class PromptManager:
         chapters_content: str,
     ) -> str:
         """生成人设专项检查提示词（KB2 帮回系统）"""
-        return cls.CHARACTER_CHECK_PROMPT.format(
+        static_part, dynamic_part = cls.generate_character_check_prompt_parts(
+            character_name=character_name,
+            character_profile=character_profile,
+            chapters_content=chapters_content,
+        )
+        return static_part + dynamic_part
+
+    @classmethod
+    def generate_character_check_prompt_parts(
+        cls,
+        character_name: str,
+        character_profile: str,
+        chapters_content: str,
+    ) -> tuple:
+        """生成人设专项检查提示词的 (静态评分标准, 动态输入) 二元组"""
+        return cls.CHARACTER_CHECK_RUBRIC, cls.CHARACTER_CHECK_INPUT.format(
             character_name=character_name,
             character_profile=character_profile,
             chapters_content=chapters_content,
@@ -1589,6 +1732,27 @@ class PromptManager:
         opening_chapters: str,
     ) -> str:
         """生成开篇质量专项检查提示词（KB2 黄金开篇五大铁律）"""
-        return cls.OPENING_CHECK_PROMPT.format(
+        static_part, dynamic_part = cls.generate_opening_check_prompt_parts(
+            opening_chapters=opening_chapters,
+        )
+        return static_part + dynamic_part
+
+    @classmethod
+    def generate_opening_check_prompt_parts(
+        cls,
+        opening_chapters: str,
+    ) -> tuple:
+        """生成开篇质量专项检查提示词的 (静态评分标准, 动态输入) 二元组"""
+        return cls.OPENING_CHECK_RUBRIC, cls.OPENING_CHECK_INPUT.format(
             opening_chapters=opening_chapters,
         )
+
+
+@lru_cache(maxsize=1)
+def get_prompt_manager() -> PromptManager:
+    """返回进程内共享的 PromptManager 单例
+
+    模板均为类属性、实例无状态，各生成器复用同一实例即可，
+    避免批量流水线中逐章节重复构造。
+    """
+    return PromptManager()
@@ -12,6 +12,7 @@ from ainovel.db.style_profile import StyleProfile
 from ainovel.memory.character import Character
 from ainovel.memory.world_data import WorldData
 from ainovel.memory.plot_arc import PlotArc
+from ainovel.cache.llm_cache import LLMCacheEntry
 from ainovel.db.crud import (
     CRUDBase,
     NovelCRUD,
@@ -41,6 +42,7 @@ __all__ = [
     "Character",
     "WorldData",
     "PlotArc",
+    "LLMCacheEntry",
     # CRUD
     "CRUDBase",
     "NovelCRUD",
@@ -3,7 +3,7 @@ Chapter（章节）模型
 
 表示分卷中的一个章节
 """
-from sqlalchemy import String, Text, Integer, ForeignKey
+from sqlalchemy import String, Text, Integer, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ainovel.db.base import Base, TimestampMixin
@@ -13,6 +13,10 @@ class Chapter(Base, TimestampMixin):
     """章节模型"""
 
     __tablename__ = "chapters"
+    __table_args__ = (
+        # 覆盖前情回顾等"按分卷取相邻章节"的查询，使其走复合索引扫描
+        Index("ix_chapters_volume_id_order", "volume_id", "order"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, comment="主键")
     volume_id: Mapped[int] = mapped_column(
@@ -50,6 +54,34 @@ class Chapter(Base, TimestampMixin):
     def __repr__(self) -> str:
         return f"Chapter(id={self.id}, title={self.title!r}, order={self.order}, volume_id={self.volume_id}, word_count={self.word_count})"
 
+    @property
+    def characters_involved_list(self) -> list[str]:
+        """
+        解析后的涉及角色名列表（实例级缓存）
+
+        characters_involved 存储为 JSON 文本；同一实例重复访问时
+        直接返回缓存结果，字段被重新赋值后缓存自动失效。
+        解析失败或字段为空返回空列表。
+        """
+        raw = self.characters_involved
+        cached = getattr(self, "_characters_involved_cache", None)
+        if cached is not None and cached[0] is raw:
+            return cached[1]
+
+        if not raw:
+            parsed: list[str] = []
+        else:
+            try:
+                import json
+
+                data = json.loads(raw)
+                parsed = [str(name) for name in data] if isinstance(data, list) else []
+            except (TypeError, ValueError):
+                parsed = []
+
+        self._characters_involved_cache = (raw, parsed)
+        return parsed
+
     def update_word_count(self) -> None:
         """更新字数统计（中文字符计数）"""
         try:
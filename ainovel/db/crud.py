@@ -5,7 +5,7 @@ CRUD 操作基类和管理器
 """
 from typing import TypeVar, Generic, Type, List, Optional
 from sqlalchemy import select, func
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from ainovel.db.base import Base
 
@@ -198,6 +198,22 @@ class ChapterCRUD(CRUDBase[Chapter]):
         stmt = select(Chapter).where(Chapter.volume_id == volume_id, Chapter.order == order)
         return session.scalar(stmt)
 
+    def get_by_ids(self, session: Session, chapter_ids: List[int]) -> List[Chapter]:
+        """根据 ID 列表批量查询章节（单条 IN 查询，避免逐章往返）"""
+        if not chapter_ids:
+            return []
+        stmt = select(Chapter).where(Chapter.id.in_(chapter_ids))
+        return list(session.scalars(stmt).all())
+
+    def get_by_id_with_parents(self, session: Session, chapter_id: int) -> Optional[Chapter]:
+        """根据 ID 查询章节并预加载所属分卷和小说（单条 JOIN 查询）"""
+        stmt = (
+            select(Chapter)
+            .options(joinedload(Chapter.volume).joinedload(Volume.novel))
+            .where(Chapter.id == chapter_id)
+        )
+        return session.scalar(stmt)
+
     def search_by_content(
         self, session: Session, keyword: str, skip: int = 0, limit: int = 100
     ) -> List[Chapter]:
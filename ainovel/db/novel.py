@@ -85,8 +85,14 @@ class Novel(Base, TimestampMixin):
     )
 
     # 关系：一对多，一部小说包含多个分卷
+    # order_by 把卷序排序下推到 SQL（order 列已建索引），
+    # Python 侧遍历 novel.volumes 即为卷序
     volumes: Mapped[List["Volume"]] = relationship(
-        "Volume", back_populates="novel", cascade="all, delete-orphan", lazy="selectin"
+        "Volume",
+        back_populates="novel",
+        cascade="all, delete-orphan",
+        lazy="selectin",
+        order_by="Volume.order",
     )
 
     # 关系：一对多，一部小说可有多个文风档案
@@ -94,5 +100,19 @@ class Novel(Base, TimestampMixin):
         "StyleProfile", back_populates="novel", cascade="all, delete-orphan", lazy="selectin"
     )
 
+    @property
+    def ordered_chapters(self) -> List["Chapter"]:
+        """
+        按（卷序，章序）展平的全部章节列表
+
+        排序规则的单一出处，编排器/流水线遍历章节时统一经此获取。
+        排序由关系的 order_by 下推到 SQL 完成，此处仅展平。
+        普通 property 而非 cached_property：ORM 实例在会话内可能
+        新增章节，缓存会读到陈旧列表
+        """
+        return [
+            chapter for volume in self.volumes for chapter in volume.chapters
+        ]
+
     def __repr__(self) -> str:
         return f"Novel(id={self.id}, title={self.title!r}, status={self.status.value})"
@@ -34,8 +34,14 @@ class Volume(Base, TimestampMixin):
     novel: Mapped["Novel"] = relationship("Novel", back_populates="volumes")
 
     # 关系：一对多，一个分卷包含多个章节
+    # order_by 把章序排序下推到 SQL（order 列已建索引），
+    # Python 侧遍历 volume.chapters 即为章序
     chapters: Mapped[List["Chapter"]] = relationship(
-        "Chapter", back_populates="volume", cascade="all, delete-orphan", lazy="selectin"
+        "Chapter",
+        back_populates="volume",
+        cascade="all, delete-orphan",
+        lazy="selectin",
+        order_by="Chapter.order",
     )
 
     def __repr__(self) -> str:
@@ -5,7 +5,7 @@ LLM客户端抽象基类
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional
 from loguru import logger
 
 
@@ -66,6 +66,43 @@ class BaseLLMClient(ABC):
         """
         pass
 
+    def generate_stream(
+        self,
+        messages: List[Dict[str, str]],
+        on_delta: Optional[Callable[[str], None]] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        流式生成文本（子类可选重写）
+
+        与 generate 返回相同结构的结果字典，区别在于生成过程中
+        每收到一段增量文本就回调 on_delta(delta)，上层可以边收边做
+        增量解析（如 JSON 括号配平扫描），把解析开销与网络 I/O 重叠。
+
+        默认实现退化为一次 generate 调用 + 单次回调完整内容，
+        不支持流式的客户端无需改动即可被统一调用。
+
+        Args:
+            messages: 对话历史
+            on_delta: 每段增量文本的回调，None 表示不需要增量
+            temperature: 温度参数
+            max_tokens: 最大生成token数
+
+        Returns:
+            与 generate 相同的结果字典
+        """
+        result = self.generate(
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs,
+        )
+        if on_delta is not None:
+            on_delta(result["content"])
+        return result
+
     @abstractmethod
     def count_tokens(self, text: str) -> int:
         """
@@ -135,6 +172,15 @@ class BaseLLMClient(ABC):
         """
         return False
 
+    def supports_prompt_caching(self) -> bool:
+        """
+        是否支持显式提示词前缀缓存（消息内容块携带 cache_control）。
+
+        默认 False；具体客户端可按能力覆盖。
+        支持时上层可将静态前缀作为独立内容块发送，命中缓存以降低成本与首token延迟。
+        """
+        return False
+
     def get_capabilities(self) -> Dict[str, bool]:
         """
         返回当前客户端能力声明。
@@ -142,4 +188,5 @@ class BaseLLMClient(ABC):
         return {
             "json_mode": self.supports_json_mode(),
             "structured_output": self.supports_structured_output(),
+            "prompt_caching": self.supports_prompt_caching(),
         }
@@ -9,7 +9,8 @@ Anthropic Claude客户端实现
 """
 
 from typing import List, Dict, Any
-from anthropic import Anthropic
+import httpx
+from anthropic import Anthropic, DefaultHttpxClient
 from anthropic.types import Message
 from tenacity import (
     retry,
@@ -56,9 +57,15 @@ class ClaudeClient(BaseLLMClient):
             raise APIKeyError("Anthropic API密钥未配置或无效")
 
         # 初始化Anthropic客户端
+        # 显式传入连接池：keepalive 连接数 ≥ 批量并发度，
+        # 并发章节检查复用长连接，避免逐请求 TLS 握手
         self.client = Anthropic(
             api_key=api_key,
             timeout=kwargs.get("timeout", 60),
+            http_client=DefaultHttpxClient(
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                timeout=kwargs.get("timeout", 60),
+            ),
         )
 
     @retry(
@@ -197,3 +204,7 @@ class ClaudeClient(BaseLLMClient):
     def supports_structured_output(self) -> bool:
         """Claude 支持结构化工具能力。"""
         return True
+
+    def supports_prompt_caching(self) -> bool:
+        """Claude 支持消息内容块携带 cache_control 的显式前缀缓存。"""
+        return True
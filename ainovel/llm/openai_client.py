@@ -8,8 +8,9 @@ OpenAI客户端实现
 - gpt-3.5-turbo
 """
 
-from typing import List, Dict, Any
-from openai import OpenAI
+from typing import List, Dict, Any, Callable, Optional
+import httpx
+from openai import OpenAI, DefaultHttpxClient
 from openai.types.chat import ChatCompletion
 from tenacity import (
     retry,
@@ -57,10 +58,16 @@ class OpenAIClient(BaseLLMClient):
             raise APIKeyError("OpenAI API密钥未配置或无效")
 
         # 初始化OpenAI客户端
+        # 显式传入连接池：keepalive 连接数 ≥ 批量并发度，
+        # 并发章节检查复用长连接，避免逐请求 TLS 握手
         self.client = OpenAI(
             api_key=api_key,
             base_url=kwargs.get("api_base", "https://api.openai.com/v1"),
             timeout=kwargs.get("timeout", 400),
+            http_client=DefaultHttpxClient(
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                timeout=kwargs.get("timeout", 400),
+            ),
         )
 
         # 初始化tiktoken编码器(用于Token计数)
@@ -169,6 +176,143 @@ class OpenAIClient(BaseLLMClient):
             else:
                 raise LLMError(f"OpenAI API调用失败: {e}")
 
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception_type(RateLimitError),
+        reraise=True,
+    )
+    def _create_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        **kwargs,
+    ):
+        """
+        建立流式连接（限流自动重试，最多3次指数退避）
+
+        重试只覆盖连接建立阶段：增量一经 on_delta 推出便不可撤回，
+        整函数重试会把已推送的增量重放给下游（SSE 消费方、增量解析器），
+        因此只在首个增量发出前重试
+        """
+        try:
+            return self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                stream_options={"include_usage": True},
+                **kwargs,
+            )
+        except Exception as e:
+            if "rate_limit" in str(e).lower() or "429" in str(e):
+                logger.warning(f"OpenAI限流: {e}")
+                raise RateLimitError(f"OpenAI限流: {e}")
+            raise
+
+    def generate_stream(
+        self,
+        messages: List[Dict[str, str]],
+        on_delta: Optional[Callable[[str], None]] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        流式调用OpenAI API生成文本
+
+        每收到一段增量即回调 on_delta，上层可边收边做增量解析。
+        通过 stream_options.include_usage 在流末尾取用量；
+        服务端未返回用量时用tiktoken估算降级。
+        限流重试由 _create_stream 承担；迭代中途的限流直接上抛，
+        避免重试重放已推送的增量。
+
+        Args:
+            messages: 对话历史
+            on_delta: 每段增量文本的回调
+            temperature: 温度参数
+            max_tokens: 最大生成token数
+
+        Returns:
+            与 generate 相同的结果字典
+        """
+        try:
+            logger.debug(f"流式调用OpenAI API, 模型: {self.model}, 消息数: {len(messages)}")
+
+            stream = self._create_stream(messages, temperature, max_tokens, **kwargs)
+
+            parts: List[str] = []
+            usage = None
+            model_name = self.model
+            finish_reason = None
+            for chunk in stream:
+                if chunk.usage is not None:
+                    usage = chunk.usage
+                if chunk.model:
+                    model_name = chunk.model
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+                delta = choice.delta.content if choice.delta else None
+                if delta:
+                    parts.append(delta)
+                    if on_delta is not None:
+                        on_delta(delta)
+
+            content = "".join(parts)
+
+            if usage is not None:
+                input_tokens = usage.prompt_tokens
+                output_tokens = usage.completion_tokens
+            else:
+                # 降级：部分兼容接口不支持 include_usage
+                input_tokens = sum(self.count_tokens(m.get("content", "")) for m in messages)
+                output_tokens = self.count_tokens(content)
+
+            cost = self.estimate_cost(input_tokens, output_tokens)
+
+            result = {
+                "content": content,
+                "usage": {
+                    "input_tokens": input_tokens,
+                    "output_tokens": output_tokens,
+                    "total_tokens": input_tokens + output_tokens,
+                },
+                "cost": cost,
+                "model": model_name,
+                "finish_reason": finish_reason,
+            }
+
+            logger.info(
+                f"OpenAI流式生成成功, "
+                f"输入: {input_tokens} tokens, "
+                f"输出: {output_tokens} tokens, "
+                f"成本: ${cost:.6f}"
+            )
+            if finish_reason == "length":
+                logger.warning("OpenAI输出因max_tokens达到上限被截断（finish_reason=length）")
+
+            return result
+
+        except LLMError:
+            # _create_stream 已完成异常映射（含重试耗尽的限流），不再二次包装
+            raise
+        except Exception as e:
+            # 统一错误处理（与 generate 保持一致）
+            if "rate_limit" in str(e).lower() or "429" in str(e):
+                logger.warning(f"OpenAI限流: {e}")
+                raise RateLimitError(f"OpenAI限流: {e}")
+            elif "invalid_api_key" in str(e).lower() or "401" in str(e):
+                raise APIKeyError(f"OpenAI API密钥无效: {e}")
+            elif "maximum context length" in str(e).lower():
+                raise TokenLimitError(f"Token超限: {e}")
+            else:
+                raise LLMError(f"OpenAI API调用失败: {e}")
+
     def count_tokens(self, text: str) -> int:
         """
         使用tiktoken计算Token数量
@@ -5,6 +5,7 @@ CharacterDatabase 服务类
 """
 from datetime import datetime
 from typing import List, Dict, Any, Optional
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from ainovel.memory.character import Character, MBTIType
@@ -56,6 +57,40 @@ class CharacterDatabase:
         )
         return character
 
+    def bulk_create_characters(
+        self, novel_id: int, rows: List[Dict[str, Any]]
+    ) -> int:
+        """
+        批量创建角色（单条多行 INSERT，避免逐条 flush 往返）
+
+        Args:
+            novel_id: 小说 ID
+            rows: 角色字段列表，每项含 name/mbti/background，
+                  personality_traits 可选
+
+        Returns:
+            创建的角色数量
+        """
+        if not rows:
+            return 0
+
+        self.session.execute(
+            insert(Character),
+            [
+                {
+                    "novel_id": novel_id,
+                    "name": row["name"],
+                    "mbti": row["mbti"],
+                    "background": row["background"],
+                    "personality_traits": row.get("personality_traits", {}),
+                    "memories": [],
+                    "relationships": {},
+                }
+                for row in rows
+            ],
+        )
+        return len(rows)
+
     def get_character(self, character_id: int) -> Optional[Character]:
         """
         根据 ID 获取角色
@@ -95,6 +130,20 @@ class CharacterDatabase:
         """
         return character_crud.get_by_novel_id(self.session, novel_id, skip, limit)
 
+    def get_main_character(self, novel_id: int) -> Optional[Character]:
+        """
+        获取主角（按约定为建档最早的角色）
+
+        数据库层 LIMIT 1 取单行，免去为提取主角信息物化全部角色
+
+        Args:
+            novel_id: 小说 ID
+
+        Returns:
+            主角实例，小说无角色时返回 None
+        """
+        return character_crud.get_first_by_novel_id(self.session, novel_id)
+
     def get_memory_cards(
         self,
         novel_id: int,
@@ -113,11 +162,10 @@ class CharacterDatabase:
             角色记忆卡列表
         """
         if character_names:
-            characters = []
-            for name in character_names:
-                char = self.get_character_by_name(novel_id, name)
-                if char:
-                    characters.append(char)
+            # 单条 IN 查询批量获取，按名称顺序组装
+            rows = character_crud.get_by_names(self.session, novel_id, character_names)
+            by_name = {char.name: char for char in rows}
+            characters = [by_name[name] for name in character_names if name in by_name]
         else:
             characters = self.list_characters(novel_id, limit=8)
 
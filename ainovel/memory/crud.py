@@ -20,6 +20,17 @@ class CharacterCRUD(CRUDBase[Character]):
         stmt = select(Character).where(Character.novel_id == novel_id, Character.name == name)
         return session.scalar(stmt)
 
+    def get_by_names(
+        self, session: Session, novel_id: int, names: List[str]
+    ) -> List[Character]:
+        """根据小说 ID 和角色名列表批量查询角色（单条 IN 查询，避免 N+1）"""
+        if not names:
+            return []
+        stmt = select(Character).where(
+            Character.novel_id == novel_id, Character.name.in_(names)
+        )
+        return list(session.scalars(stmt).all())
+
     def get_by_novel_id(
         self, session: Session, novel_id: int, skip: int = 0, limit: int = 100
     ) -> List[Character]:
@@ -33,6 +44,18 @@ class CharacterCRUD(CRUDBase[Character]):
         )
         return list(session.scalars(stmt).all())
 
+    def get_first_by_novel_id(
+        self, session: Session, novel_id: int
+    ) -> Optional[Character]:
+        """取小说建档最早的角色（数据库层 LIMIT 1，不物化整个列表）"""
+        stmt = (
+            select(Character)
+            .where(Character.novel_id == novel_id)
+            .order_by(Character.id)
+            .limit(1)
+        )
+        return session.scalars(stmt).first()
+
     def get_by_mbti(
         self, session: Session, novel_id: int, mbti: MBTIType, skip: int = 0, limit: int = 100
     ) -> List[Character]:
@@ -5,6 +5,7 @@ WorldDatabase 服务类
 """
 import json
 from typing import List, Dict, Any, Optional
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from ainovel.memory.world_data import WorldData, WorldDataType
@@ -193,6 +194,36 @@ class WorldDatabase:
         self.session.flush()
         return rule
 
+    def bulk_create(self, novel_id: int, rows: List[Dict[str, Any]]) -> int:
+        """
+        批量创建世界观数据（单条多行 INSERT，避免逐条 flush 往返）
+
+        Args:
+            novel_id: 小说 ID
+            rows: 数据字段列表，每项含 data_type/name/description，
+                  properties 可选
+
+        Returns:
+            创建的数据数量
+        """
+        if not rows:
+            return 0
+
+        self.session.execute(
+            insert(WorldData),
+            [
+                {
+                    "novel_id": novel_id,
+                    "data_type": row["data_type"],
+                    "name": row["name"],
+                    "description": row["description"],
+                    "properties": row.get("properties", {}),
+                }
+                for row in rows
+            ],
+        )
+        return len(rows)
+
     def get_world_data(self, world_data_id: int) -> Optional[WorldData]:
         """
         根据 ID 获取世界观数据
@@ -10,7 +10,7 @@ from sqlalchemy.orm import Session
 from loguru import logger
 
 from ainovel.llm.base import BaseLLMClient
-from ainovel.core.prompt_manager import PromptManager
+from ainovel.core.prompt_manager import get_prompt_manager
 from ainovel.db.crud import style_profile_crud
 
 
@@ -23,7 +23,7 @@ class StyleAnalyzer:
             llm_client: LLM客户端，用于调用模型分析文本
         """
         self.llm_client = llm_client
-        self.prompt_manager = PromptManager()
+        self.prompt_manager = get_prompt_manager()
 
     def analyze(
         self,
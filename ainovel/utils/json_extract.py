@@ -0,0 +1,112 @@
+"""
+JSON 对象提取工具
+
+从 LLM 原始输出中定位第一个完整的 JSON 对象。
+线性括号深度扫描（识别字符串字面量与转义），
+替代贪婪 DOTALL 正则在大输出上的回溯/全量扫描，复杂度稳定 O(n)。
+"""
+from typing import Optional
+
+
+class IncrementalJSONScanner:
+    """
+    增量 JSON 对象扫描器
+
+    逐段喂入流式输出的文本增量，括号配平状态跨段保持；
+    首个顶层 JSON 对象闭合的瞬间即可取到完整子串，
+    解析不再等整段响应收完，与网络 I/O 重叠。
+    """
+
+    def __init__(self) -> None:
+        self._parts: list = []   # 已进入对象后的文本片段
+        self._started = False    # 是否已见到首个 {
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._result: Optional[str] = None
+
+    @property
+    def result(self) -> Optional[str]:
+        """已闭合的首个顶层 JSON 对象子串；尚未闭合时为 None"""
+        return self._result
+
+    def feed(self, chunk: str) -> Optional[str]:
+        """
+        喂入一段增量文本，返回闭合的 JSON 子串（未闭合返回 None）
+
+        对象闭合后继续 feed 为空操作，结果保持不变。
+        """
+        if self._result is not None or not chunk:
+            return self._result
+
+        offset = 0
+        if not self._started:
+            start = chunk.find("{")
+            if start == -1:
+                return None
+            self._started = True
+            offset = start
+
+        for i in range(offset, len(chunk)):
+            ch = chunk[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._parts.append(chunk[offset: i + 1])
+                    self._result = "".join(self._parts)
+                    self._parts = []
+                    return self._result
+
+        self._parts.append(chunk[offset:])
+        return None
+
+
+def find_json_object(s: str) -> Optional[str]:
+    """
+    返回 s 中第一个配平的 JSON 对象子串；找不到返回 None。
+
+    Args:
+        s: 含有 JSON 对象的原始文本（如 LLM 输出）
+
+    Returns:
+        从第一个 '{' 到与之配对的 '}' 的子串，括号深度按字符串语义计算
+        （引号内的花括号不参与配平，支持反斜杠转义）
+    """
+    start = s.find("{")
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escape = False
+    for i in range(start, len(s)):
+        ch = s[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return s[start : i + 1]
+    return None
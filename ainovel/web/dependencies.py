@@ -7,7 +7,7 @@ from typing import Annotated, Generator
 from fastapi import Depends
 from sqlalchemy.orm import Session
 
-from ainovel.db.database import Database
+from ainovel.db.database import Database, init_database
 from ainovel.llm.base import BaseLLMClient
 from ainovel.llm.factory import LLMFactory
 from ainovel.llm.exceptions import APIKeyError, LLMError
@@ -27,12 +27,16 @@ def get_database() -> Database:
     """
     获取全局 Database 实例
 
+    经 init_database 同步注册为 ainovel.db.database 的全局实例：
+    批量路径的工作线程通过 db 层的 get_database() 获取独立会话，
+    与 Web 层共用同一个 Database，无需 CLI 的显式初始化
+
     Returns:
         Database 实例
     """
     global _db_instance
     if _db_instance is None:
-        _db_instance = Database(settings.DATABASE_URL)
+        _db_instance = init_database(settings.DATABASE_URL)
     return _db_instance
 
 
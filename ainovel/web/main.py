@@ -8,7 +8,7 @@ from pathlib import Path
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, Response
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from loguru import logger
 
 from ainovel.web.config import settings
@@ -20,6 +20,8 @@ app = FastAPI(
     version=settings.APP_VERSION,
     description="AI小说创作系统 Web 界面",
     debug=settings.DEBUG,
+    # JSON 响应统一走 orjson 序列化
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -62,6 +64,10 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """应用关闭时执行"""
+    # 等待后台全流程任务收尾，避免 LLM 调用中途被强杀
+    from ainovel.web.routers.workflow import wait_background_tasks
+
+    await wait_background_tasks(timeout=30.0)
     logger.info("🛑 应用关闭")
 
 
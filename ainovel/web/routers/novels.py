@@ -3,6 +3,8 @@
 
 提供小说项目的 CRUD 操作
 """
+import asyncio
+
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
@@ -266,7 +268,8 @@ async def generate_title_synopsis(novel_id: int, session: SessionDep, orchestrat
         }
     """
     try:
-        result = orchestrator.generate_title_synopsis(session, novel_id)
+        # LLM 调用为阻塞 I/O，放入线程池执行，避免占住事件循环
+        result = await asyncio.to_thread(orchestrator.generate_title_synopsis, session, novel_id)
         return result
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
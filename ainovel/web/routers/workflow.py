@@ -4,105 +4,157 @@
 提供6步创作流程的 API 接口
 """
 import asyncio
+import hashlib
+import os
+import queue
+from pathlib import Path
 from typing import Optional
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import RedirectResponse, HTMLResponse
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import RedirectResponse, HTMLResponse, ORJSONResponse, StreamingResponse
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from loguru import logger
 from pydantic import BaseModel
 
 from ainovel.web.dependencies import SessionDep, OrchestratorDep
-from ainovel.web.schemas.workflow import *
+from ainovel.web.schemas.workflow import (
+    WorkflowStatusResponse,
+    Step1Request,
+    Step1Response,
+    Step1UpdateRequest,
+    Step2Response,
+    Step2UpdateRequest,
+    Step3Response,
+    Step4Response,
+    Step4BatchResponse,
+    Step5Request,
+    Step5Response,
+    Step6Response,
+    Step6BatchResponse,
+    Step6BatchAnalysisRequest,
+    ConsistencyCheckRequest,
+    ConsistencyCheckResponse,
+    ChapterRewriteRequest,
+    ChapterRewriteResponse,
+    ChapterRollbackRequest,
+    ChapterRollbackResponse,
+    PipelineRunRequest,
+    PipelineRunResponse,
+)
 from ainovel.db.crud import novel_crud, chapter_crud
 
 router = APIRouter()
 
+# 模块级 Jinja2 环境：模板编译一次后缓存复用
+_TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
+_jinja_env = Environment(
+    loader=FileSystemLoader(str(_TEMPLATES_DIR)),
+    autoescape=select_autoescape(["html"]),
+    auto_reload=False,
+)
+_status_template = _jinja_env.get_template("partials/full_run_status.html")
+
 # 进程内全流程任务状态追踪
 # { novel_id: { "phase": str, "error": str|None, "done": bool } }
 _full_run_tasks: dict[int, dict] = {}
 
+# 批量摘要压缩的并发上限（可通过环境变量覆盖）
+_COMPRESS_CONCURRENCY = int(os.environ.get("AINOVEL_COMPRESS_CONCURRENCY", "4"))
+
+# 批量生成（细纲/质检）的并发上限（可通过环境变量覆盖）
+_BATCH_CONCURRENCY = int(os.environ.get("AINOVEL_BATCH_CONCURRENCY", "4"))
+
+# 后台任务强引用集合：事件循环只持有 Task 的弱引用，
+# 不保存引用的话长时间运行的全流程任务可能被 GC 回收
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _spawn_background_task(coro) -> asyncio.Task:
+    """创建后台任务并保持强引用，完成后自动移除"""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+async def wait_background_tasks(timeout: float = 30.0) -> None:
+    """等待所有后台全流程任务结束（供应用关闭钩子调用）"""
+    if _background_tasks:
+        await asyncio.wait(_background_tasks, timeout=timeout)
+
 
 class FullRunRequest(BaseModel):
     """一键全流程生成请求"""
     initial_idea: Optional[str] = None
 
 
-def _build_status_html(novel_id: int, workflow_status: str, phase: str, error: Optional[str], done: bool) -> str:
-    """构建全流程状态 HTML 片段"""
-    status_order = [
-        "created", "planning", "world_building", "outline",
-        "detail_outline", "writing", "quality_check", "completed",
-    ]
+# 工作流状态推进顺序
+_STATUS_ORDER = (
+    "created", "planning", "world_building", "outline",
+    "detail_outline", "writing", "quality_check", "completed",
+)
+
+# 每步配置：(步骤编号, 显示名称, 该步骤变为 active 时的 idx)
+_STEPS_CFG = (
+    (1, "创作思路", 1),
+    (2, "世界观角色", 2),
+    (3, "生成大纲", 3),
+    (4, "批量细纲", 4),
+    (5, "章节正文", 5),
+)
+
+
+def _status_context(novel_id: int, workflow_status: str, phase: str, error: Optional[str], done: bool) -> dict:
+    """构建全流程状态模板的渲染上下文"""
     try:
-        idx = status_order.index(workflow_status)
+        idx = _STATUS_ORDER.index(workflow_status)
     except ValueError:
         idx = 0
 
-    # 每步配置：(步骤编号, 显示名称, 该步骤变为 active 时的 idx)
-    steps_cfg = [
-        (1, "创作思路", 1),
-        (2, "世界观角色", 2),
-        (3, "生成大纲", 3),
-        (4, "批量细纲", 4),
-        (5, "章节正文", 5),
-    ]
-
-    step_parts = []
-    for num, label, active_idx in steps_cfg:
+    steps = []
+    for num, label, active_idx in _STEPS_CFG:
         if idx > active_idx:
             icon, color = "✓", "#27ae60"
         elif idx == active_idx:
             icon, color = "⟳", "#3498db"
         else:
             icon, color = str(num), "#95a5a6"
-
-        step_parts.append(
-            f'<div style="text-align:center;flex-shrink:0;">'
-            f'<div style="width:32px;height:32px;border-radius:50%;background:{color};color:white;'
-            f'display:flex;align-items:center;justify-content:center;font-weight:bold;font-size:13px;'
-            f'margin:0 auto 4px;">{icon}</div>'
-            f'<div style="font-size:11px;color:{color};">{label}</div>'
-            f'</div>'
+        steps.append(
+            {
+                "icon": icon,
+                "color": color,
+                "label": label,
+                "line_color": "#27ae60" if idx > active_idx else "#ddd",
+            }
         )
-        if num < 5:
-            line_color = "#27ae60" if idx > active_idx else "#ddd"
-            step_parts.append(
-                f'<div style="flex:1;height:2px;background:{line_color};'
-                f'margin:0 4px 16px;border-radius:1px;"></div>'
-            )
 
-    steps_html = "".join(step_parts)
-    indicator = f'<div style="display:flex;align-items:center;gap:8px;margin-bottom:16px;">{steps_html}</div>'
-
-    if workflow_status == "completed" or (done and not error):
-        return (
-            f'<div id="full-run-area" class="card" style="border-left:4px solid #27ae60;">'
-            f'<h3 style="color:#27ae60;margin-bottom:12px;">✓ 全部步骤已完成</h3>'
-            f'{indicator}'
-            f'<p style="color:#7f8c8d;font-size:13px;margin-bottom:12px;">创作流程已全部完成，可进入章节编辑器查看结果。</p>'
-            f'<a href="/novels/editor/{novel_id}" class="btn">进入章节编辑器 →</a>'
-            f'</div>'
-        )
+    return {
+        "novel_id": novel_id,
+        "steps": steps,
+        "phase": phase,
+        "error": error,
+        "completed": workflow_status == "completed" or (done and not error),
+    }
 
-    if error:
-        safe_error = str(error).replace("<", "&lt;").replace(">", "&gt;")
-        return (
-            f'<div id="full-run-area" class="card" style="border-left:4px solid #e74c3c;">'
-            f'<h3 style="color:#e74c3c;margin-bottom:12px;">✗ 生成失败</h3>'
-            f'{indicator}'
-            f'<p style="background:#fdf0f0;padding:10px;border-radius:6px;font-size:13px;color:#c0392b;">{safe_error}</p>'
-            f'<button hx-post="/workflow/{novel_id}/full-run" hx-target="#full-run-area" '
-            f'hx-swap="outerHTML" hx-ext="json-enc" class="btn" style="margin-top:10px;background:#e74c3c;">重试</button>'
-            f'</div>'
-        )
 
-    # 运行中：包含 HTMX 轮询属性，每 2 秒刷新
-    return (
-        f'<div id="full-run-area" class="card" '
-        f'hx-get="/workflow/{novel_id}/full-run-status-html" '
-        f'hx-trigger="every 2s" hx-swap="outerHTML">'
-        f'<h3 style="margin-bottom:12px;">⚙ 自动生成中...</h3>'
-        f'{indicator}'
-        f'<p style="color:#3498db;font-size:13px;">当前阶段：{phase}</p>'
-        f'</div>'
+def _build_status_html(novel_id: int, workflow_status: str, phase: str, error: Optional[str], done: bool) -> str:
+    """构建全流程状态 HTML 片段（Jinja2 编译模板渲染，error 由模板自动转义）"""
+    return _status_template.render(**_status_context(novel_id, workflow_status, phase, error, done))
+
+
+def _stream_status_response(
+    novel_id: int,
+    workflow_status: str,
+    phase: str,
+    error: Optional[str],
+    done: bool,
+    headers: Optional[dict] = None,
+) -> StreamingResponse:
+    """流式返回状态 HTML：利用 Jinja2 的 generate() 边渲染边发送，降低首字节延迟"""
+    ctx = _status_context(novel_id, workflow_status, phase, error, done)
+    return StreamingResponse(
+        _status_template.generate(**ctx),
+        media_type="text/html",
+        headers=headers,
     )
 
 
@@ -152,34 +204,33 @@ async def full_run(
     novel_id: int,
     request_data: FullRunRequest,
     session: SessionDep,
-) -> HTMLResponse:
-    """一键全流程生成：后台依次执行步骤1→2→3→4→5→完成，立即返回状态 HTML"""
+) -> Response:
+    """一键全流程生成：后台依次执行步骤1→2→3→4→5→完成，立即流式返回状态 HTML"""
     novel = novel_crud.get_by_id(session, novel_id)
     if not novel:
         raise HTTPException(status_code=404, detail=f"小说不存在: {novel_id}")
 
     # 已完成则直接返回完成状态，不重新启动
     if novel.workflow_status.value == "completed":
-        html = _build_status_html(novel_id, "completed", "已完成", None, True)
-        return HTMLResponse(content=html)
+        return _stream_status_response(novel_id, "completed", "已完成", None, True)
 
     # 已有运行中任务则直接返回当前状态
     task = _full_run_tasks.get(novel_id)
     if task and not task["done"]:
-        html = _build_status_html(novel_id, novel.workflow_status.value, task["phase"], task["error"], task["done"])
-        return HTMLResponse(content=html)
+        return _stream_status_response(
+            novel_id, novel.workflow_status.value, task["phase"], task["error"], task["done"]
+        )
 
     initial_idea = request_data.initial_idea or novel.description or ""
     _full_run_tasks[novel_id] = {"phase": "启动中...", "error": None, "done": False}
-    asyncio.create_task(_run_full_workflow(novel_id, initial_idea))
+    _spawn_background_task(_run_full_workflow(novel_id, initial_idea))
 
-    html = _build_status_html(novel_id, novel.workflow_status.value, "启动中...", None, False)
-    return HTMLResponse(content=html)
+    return _stream_status_response(novel_id, novel.workflow_status.value, "启动中...", None, False)
 
 
 @router.get("/{novel_id}/full-run-status-html", response_class=HTMLResponse)
-async def full_run_status_html(novel_id: int, session: SessionDep) -> HTMLResponse:
-    """轮询端点：返回当前全流程状态的 HTML 片段"""
+async def full_run_status_html(novel_id: int, request: Request, session: SessionDep) -> Response:
+    """轮询端点：返回当前全流程状态的 HTML 片段（状态未变化时返回 304）"""
     novel = novel_crud.get_by_id(session, novel_id)
     if not novel:
         raise HTTPException(status_code=404, detail=f"小说不存在: {novel_id}")
@@ -187,11 +238,22 @@ async def full_run_status_html(novel_id: int, session: SessionDep) -> HTMLRespon
     task = _full_run_tasks.get(novel_id)
     if not task:
         # 无运行记录但已完成（服务器重启后），仍能正确显示完成状态
-        html = _build_status_html(novel_id, novel.workflow_status.value, "", None, True)
-        return HTMLResponse(content=html)
+        phase, error, done = "", None, True
+    else:
+        phase, error, done = task["phase"], task["error"], task["done"]
 
-    html = _build_status_html(novel_id, novel.workflow_status.value, task["phase"], task["error"], task["done"])
-    return HTMLResponse(content=html)
+    workflow_status = novel.workflow_status.value
+
+    # 长时间运行阶段每次轮询产出完全相同的 HTML，用 ETag 让浏览器跳过重新渲染
+    etag = '"' + hashlib.md5(
+        f"{workflow_status}|{phase}|{error}|{done}".encode()
+    ).hexdigest() + '"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    return _stream_status_response(
+        novel_id, workflow_status, phase, error, done, headers={"ETag": etag}
+    )
 
 
 @router.get("/{novel_id}/status", response_model=WorkflowStatusResponse)
@@ -199,7 +261,7 @@ async def get_workflow_status(novel_id: int, session: SessionDep, orch: Orchestr
     """获取工作流状态"""
     try:
         result = orch.get_workflow_status(session, novel_id)
-        return WorkflowStatusResponse(**result)
+        return WorkflowStatusResponse.model_construct(**result)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -214,7 +276,7 @@ async def step1_planning(
     """步骤1：生成创作思路"""
     try:
         result = await asyncio.to_thread(orch.step_1_planning, session, novel_id, request_data.initial_idea)
-        return Step1Response(**result)
+        return Step1Response.model_construct(**result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -241,7 +303,7 @@ async def step2_world_building(
     """步骤2：生成世界观和角色"""
     try:
         result = await asyncio.to_thread(orch.step_2_world_building, session, novel_id)
-        return Step2Response(**result)
+        return Step2Response.model_construct(**result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -266,7 +328,7 @@ async def step3_outline(novel_id: int, session: SessionDep, orch: OrchestratorDe
     """步骤3：生成大纲"""
     try:
         result = await asyncio.to_thread(orch.step_3_outline, session, novel_id)
-        return Step3Response(**result)
+        return Step3Response.model_construct(**result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -276,7 +338,7 @@ async def step4_detail_outline(chapter_id: int, session: SessionDep, orch: Orche
     """步骤4：生成详细细纲（单章节）"""
     try:
         result = await asyncio.to_thread(orch.step_4_detail_outline, session, chapter_id)
-        return Step4Response(**result)
+        return Step4Response.model_construct(**result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -285,8 +347,11 @@ async def step4_detail_outline(chapter_id: int, session: SessionDep, orch: Orche
 async def step4_batch(novel_id: int, session: SessionDep, orch: OrchestratorDep):
     """步骤4：批量生成所有章节细纲"""
     try:
-        result = await asyncio.to_thread(orch.step_4_batch_detail_outline, session, novel_id)
-        return Step4BatchResponse(**result)
+        result = await asyncio.to_thread(
+            orch.step_4_batch_detail_outline, session, novel_id, _BATCH_CONCURRENCY
+        )
+        # 批量结果为受信内部数据，直接 orjson 序列化，跳过响应模型再校验
+        return ORJSONResponse(result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -307,17 +372,66 @@ async def step5_writing(
             request_data.style_guide,
             authors_note=request_data.authors_note,
         )
-        return Step5Response(**result)
+        return Step5Response.model_construct(**result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/chapter/{chapter_id}/step5/stream")
+async def step5_writing_stream(
+    chapter_id: int,
+    request_data: Step5Request,
+    session: SessionDep,
+    orch: OrchestratorDep,
+) -> StreamingResponse:
+    """
+    步骤5（流式）：边生成边下发章节文本
+
+    生成仍在工作线程同步执行，增量片段经线程安全队列转交事件循环
+    逐段下发，首字延迟与最终篇幅无关；入库沿用整章完成后的单次 commit
+    """
+    chapter = chapter_crud.get_by_id(session, chapter_id)
+    if not chapter:
+        raise HTTPException(status_code=400, detail=f"章节不存在: {chapter_id}")
+
+    chunk_queue: queue.Queue = queue.Queue()
+    _done = object()  # 哨兵：生成线程结束（含异常）后入队，终结流
+
+    def _run() -> None:
+        try:
+            orch.step_5_writing(
+                session,
+                chapter_id,
+                request_data.style_guide,
+                authors_note=request_data.authors_note,
+                on_delta=chunk_queue.put,
+            )
+        except Exception as e:
+            # 响应头已发出，无法改写状态码，记录错误并正常终结流
+            logger.error(f"流式生成章节失败 chapter_id={chapter_id}: {e}")
+        finally:
+            chunk_queue.put(_done)
+
+    async def _iter_chunks():
+        worker = asyncio.get_running_loop().run_in_executor(None, _run)
+        try:
+            while True:
+                chunk = await asyncio.to_thread(chunk_queue.get)
+                if chunk is _done:
+                    break
+                yield chunk
+        finally:
+            await worker
+
+    return StreamingResponse(_iter_chunks(), media_type="text/plain; charset=utf-8")
+
+
 @router.post("/chapter/{chapter_id}/step6", response_model=Step6Response)
 async def step6_quality_check(chapter_id: int, session: SessionDep, orch: OrchestratorDep):
     """步骤6：质量检查（单章节）"""
     try:
         result = await asyncio.to_thread(orch.step_6_quality_check, session, chapter_id)
-        return Step6Response(**result)
+        return Step6Response.model_construct(**result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -338,7 +452,7 @@ async def consistency_check(
             content_override=request_data.content_override,
             strict=request_data.strict,
         )
-        return ConsistencyCheckResponse(**result)
+        return ConsistencyCheckResponse.model_construct(**result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -364,7 +478,7 @@ async def rewrite_chapter(
             rewrite_mode=request_data.rewrite_mode,
             save=request_data.save,
         )
-        return ChapterRewriteResponse(**result)
+        return ChapterRewriteResponse.model_construct(**result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -385,7 +499,7 @@ async def rollback_rewrite(
             history_id=request_data.history_id,
             save=request_data.save,
         )
-        return ChapterRollbackResponse(**result)
+        return ChapterRollbackResponse.model_construct(**result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -394,8 +508,11 @@ async def rollback_rewrite(
 async def step6_batch(novel_id: int, session: SessionDep, orch: OrchestratorDep):
     """步骤6：批量质量检查所有已生成章节"""
     try:
-        result = await asyncio.to_thread(orch.step_6_batch_quality_check, session, novel_id)
-        return Step6BatchResponse(**result)
+        result = await asyncio.to_thread(
+            orch.step_6_batch_quality_check, session, novel_id, _BATCH_CONCURRENCY
+        )
+        # 批量结果为受信内部数据，直接 orjson 序列化，跳过响应模型再校验
+        return ORJSONResponse(result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -433,7 +550,9 @@ async def pipeline_run(
             regenerate=request_data.regenerate,
             max_workers=request_data.max_workers,
         )
-        return PipelineRunResponse(**result)
+        # task_results 可达数百条，受信内部数据直接 orjson 序列化，
+        # 跳过响应模型再校验与 jsonable_encoder 逐项遍历
+        return ORJSONResponse(result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -448,9 +567,8 @@ async def pipeline_status(novel_id: int, session: SessionDep, orch: Orchestrator
         if not novel:
             raise HTTPException(status_code=404, detail=f"小说不存在: {novel_id}")
 
-        all_chapters = []
-        for volume in sorted(novel.volumes, key=lambda v: v.order):
-            all_chapters.extend(sorted(volume.chapters, key=lambda c: c.order))
+        # 卷/章已由关系 order_by 在 SQL 层排好序
+        all_chapters = novel.ordered_chapters
 
         chapters_with_outline = [c for c in all_chapters if c.detail_outline is not None]
         chapters_with_content = [c for c in all_chapters if c.content]
@@ -530,32 +648,43 @@ async def compress_novel_summaries(
         raise HTTPException(status_code=404, detail="小说不存在")
     try:
         from ainovel.core.context_compressor import ContextCompressor
-        compressor = ContextCompressor(orch.llm_client, session)
-
-        all_chapters = []
-        for volume in sorted(novel.volumes, key=lambda v: v.order):
-            all_chapters.extend(sorted(volume.chapters, key=lambda c: c.order))
-
-        # 只处理有正文的章节
-        target = [c for c in all_chapters if c.content and (force or not c.summary)]
-        compressed = 0
-        skipped = 0
-        for chapter in target:
-            if not force and chapter.summary:
-                skipped += 1
-                continue
-            # force 时清空缓存让 compress_and_cache 重新生成
-            if force:
+        from ainovel.web.dependencies import get_database
+
+        # 卷/章已由关系 order_by 在 SQL 层排好序
+        all_chapters = novel.ordered_chapters
+
+        # 只处理有正文的章节；列表推导已完成摘要过滤，循环内无需再判断
+        with_content = [c for c in all_chapters if c.content]
+        target = [c for c in with_content if force or not c.summary]
+        skipped = len(with_content) - len(target)
+
+        # force 时先清空缓存并提交，让各工作线程的独立 session 能看到
+        if force:
+            for chapter in target:
                 chapter_crud.update(session, chapter.id, summary=None)
-            compressor.compress_and_cache(chapter.id)
-            compressed += 1
+            session.commit()
+
+        # LLM 摘要相互独立，受限并发扇出；每个任务用独立 session，避免跨线程共享
+        llm_client = orch.llm_client
+        semaphore = asyncio.Semaphore(_COMPRESS_CONCURRENCY)
+
+        def _compress_worker(chapter_id: int) -> None:
+            db = get_database()
+            with db.session_scope() as worker_session:
+                ContextCompressor(llm_client, worker_session).compress_and_cache(chapter_id)
+
+        async def _compress(chapter_id: int) -> None:
+            async with semaphore:
+                await asyncio.to_thread(_compress_worker, chapter_id)
+
+        await asyncio.gather(*(_compress(c.id) for c in target))
 
         return {
             "ok": True,
             "novel_id": novel_id,
-            "compressed": compressed,
+            "compressed": len(target),
             "skipped": skipped,
-            "total_with_content": len([c for c in all_chapters if c.content]),
+            "total_with_content": len(with_content),
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"压缩失败: {e}")
@@ -651,6 +780,27 @@ async def analyze_character(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/{novel_id}/analyze/batch", summary="多维度批量分析（KB2 帮回系统）")
+async def analyze_batch(
+    novel_id: int,
+    request_data: Step6BatchAnalysisRequest,
+    session: SessionDep,
+    orch: OrchestratorDep,
+):
+    """一次请求执行多个分析维度：共享章节读取，各维度 LLM 调用并行执行"""
+    try:
+        return await asyncio.to_thread(
+            orch.analyze_multi,
+            session,
+            novel_id,
+            request_data.dimensions,
+            request_data.chapter_range,
+            request_data.character_name,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.post("/{novel_id}/analyze/opening", summary="开篇质量专项检查（KB2 黄金开篇五大铁律）")
 async def analyze_opening(
     novel_id: int,
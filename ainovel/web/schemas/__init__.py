@@ -1 +1,21 @@
-"""Schemas 模块初始化"""
+"""
+Schemas 模块初始化
+
+ainovel.web.schemas.novel 是 NovelResponse 等小说模型的唯一定义处，
+此处统一再导出，避免出现第二份定义被导入顺序遮蔽。
+"""
+from ainovel.web.schemas.novel import (
+    NovelCreate,
+    NovelUpdate,
+    NovelResponse,
+    NovelListResponse,
+    NovelDetailResponse,
+)
+
+__all__ = [
+    "NovelCreate",
+    "NovelUpdate",
+    "NovelResponse",
+    "NovelListResponse",
+    "NovelDetailResponse",
+]
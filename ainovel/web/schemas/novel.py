@@ -5,7 +5,7 @@
 """
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 # ============ 请求模型 (Request Models) ============
@@ -48,15 +48,15 @@ class NovelResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+    @field_validator("plots", mode="before")
     @classmethod
-    def model_validate(cls, obj, **kwargs):
+    def _split_plots(cls, v):
         # 将数据库中逗号分隔字符串转换为列表
-        data = obj.__dict__.copy() if hasattr(obj, "__dict__") else dict(obj)
-        if isinstance(data.get("plots"), str):
-            data["plots"] = [p for p in data["plots"].split(",") if p]
-        elif data.get("plots") is None:
-            data["plots"] = []
-        return super().model_validate(data, **kwargs)
+        if v is None:
+            return []
+        if isinstance(v, str):
+            return [p for p in v.split(",") if p]
+        return v
 
     class Config:
         from_attributes = True  # Pydantic v2
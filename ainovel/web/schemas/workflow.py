@@ -1,8 +1,72 @@
 """
 工作流相关的 Pydantic 模型
 """
-from typing import Optional, Any
-from pydantic import BaseModel, Field
+import dataclasses
+from dataclasses import dataclass
+from typing import Literal, Optional, Any
+
+from pydantic import BaseModel, ConfigDict, Field, SkipValidation
+from typing_extensions import TypedDict
+
+
+# ============ 响应负载结构（TypedDict：只作结构提示，不做逐项运行时校验） ============
+
+
+class CharacterPayload(TypedDict, total=False):
+    """步骤2响应中的角色条目（LLM 输出，允许附带额外字段）"""
+
+    __pydantic_config__ = ConfigDict(extra="allow")
+
+    name: str
+    role: str
+    mbti: str
+    background: str
+    personality_traits: dict[str, Any]
+
+
+class WorldDataPayload(TypedDict, total=False):
+    """步骤2响应中的世界观条目"""
+
+    __pydantic_config__ = ConfigDict(extra="allow")
+
+    data_type: str
+    name: str
+    description: str
+    properties: dict[str, Any]
+
+
+class VolumePayload(TypedDict, total=False):
+    """步骤3响应中的分卷条目（含章节列表）"""
+
+    __pydantic_config__ = ConfigDict(extra="allow")
+
+    title: str
+    order: int
+    description: str
+    chapters: list[dict[str, Any]]
+
+
+class IssuePayload(TypedDict, total=False):
+    """一致性检查响应中的问题条目"""
+
+    __pydantic_config__ = ConfigDict(extra="allow")
+
+    severity: str
+    type: str
+    location: str
+    description: str
+    suggestion: str
+
+
+class BatchItemPayload(TypedDict, total=False):
+    """批量细纲/质检响应中的单章节结果条目"""
+
+    __pydantic_config__ = ConfigDict(extra="allow")
+
+    chapter_id: int
+    chapter_title: str
+    success: bool
+    error: str
 
 
 # ============ 请求模型 ============
@@ -54,6 +118,16 @@ class ChapterRewriteRequest(BaseModel):
     save: bool = Field(False, description="是否保存改写结果到章节正文")
 
 
+class Step6BatchAnalysisRequest(BaseModel):
+    """多维度批量分析请求"""
+
+    dimensions: list[
+        Literal["satisfaction", "rhythm", "conflict", "character", "opening"]
+    ] = Field(..., min_length=1, description="分析维度列表")
+    chapter_range: Optional[str] = Field(None, description="章节范围，如 '1-10'，None 表示全部")
+    character_name: Optional[str] = Field(None, description="character 维度所需的角色名")
+
+
 class ChapterRollbackRequest(BaseModel):
     """章节改写回滚请求"""
 
@@ -64,7 +138,13 @@ class ChapterRollbackRequest(BaseModel):
 # ============ 响应模型 ============
 
 
-class WorkflowStatusResponse(BaseModel):
+class WorkflowResponseBase(BaseModel):
+    """响应模型基类：延迟构建校验器，避免导入时为每个 DTO 预分配 validator/serializer"""
+
+    model_config = ConfigDict(defer_build=True)
+
+
+class WorkflowStatusResponse(WorkflowResponseBase):
     """工作流状态响应"""
 
     novel_id: int
@@ -73,59 +153,59 @@ class WorkflowStatusResponse(BaseModel):
     can_continue: bool
 
 
-class Step1Response(BaseModel):
+class Step1Response(WorkflowResponseBase):
     """步骤1：创作思路生成响应"""
 
     novel_id: int
     workflow_status: str
     planning: str
-    stats: dict[str, Any]
+    stats: SkipValidation[dict[str, Any]]
 
 
-class Step2Response(BaseModel):
+class Step2Response(WorkflowResponseBase):
     """步骤2：世界观和角色生成响应"""
 
     novel_id: int
     workflow_status: str
-    characters: list[dict[str, Any]]
-    world_data: list[dict[str, Any]]
-    stats: dict[str, Any]
+    characters: SkipValidation[list[CharacterPayload]]
+    world_data: SkipValidation[list[WorldDataPayload]]
+    stats: SkipValidation[dict[str, Any]]
     raw_content: Optional[str] = Field(None, description="大模型原始输出文本")
     parse_failed: bool = Field(False, description="JSON解析是否失败，失败时需用户手动修改raw_content")
 
 
-class Step3Response(BaseModel):
+class Step3Response(WorkflowResponseBase):
     """步骤3：大纲生成响应"""
 
     novel_id: int
     workflow_status: str
-    volumes: list[dict[str, Any]]
-    stats: dict[str, Any]
+    volumes: SkipValidation[list[VolumePayload]]
+    stats: SkipValidation[dict[str, Any]]
     raw_content: Optional[str] = Field(None, description="大模型原始输出文本")
     parse_failed: bool = Field(False, description="JSON解析是否失败，失败时需用户手动修改raw_content")
 
 
-class Step4Response(BaseModel):
+class Step4Response(WorkflowResponseBase):
     """步骤4：详细细纲生成响应"""
 
     novel_id: int
     workflow_status: str
     chapter_id: int
     chapter_title: str
-    detail_outline: dict[str, Any]
-    stats: dict[str, Any]
+    detail_outline: SkipValidation[dict[str, Any]]
+    stats: SkipValidation[dict[str, Any]]
 
 
-class Step4BatchResponse(BaseModel):
+class Step4BatchResponse(WorkflowResponseBase):
     """步骤4：批量细纲生成响应"""
 
     novel_id: int
     workflow_status: str
     total_chapters: int
-    results: list[dict[str, Any]]
+    results: SkipValidation[list[BatchItemPayload]]
 
 
-class Step5Response(BaseModel):
+class Step5Response(WorkflowResponseBase):
     """步骤5：章节内容生成响应"""
 
     novel_id: int
@@ -133,30 +213,30 @@ class Step5Response(BaseModel):
     chapter_id: int
     chapter_title: str
     content: str
-    stats: dict[str, Any]
+    stats: SkipValidation[dict[str, Any]]
 
 
-class Step6Response(BaseModel):
+class Step6Response(WorkflowResponseBase):
     """步骤6：质量检查响应"""
 
     novel_id: int
     workflow_status: str
     chapter_id: int
     chapter_title: str
-    quality_report: dict[str, Any]
-    stats: dict[str, Any]
+    quality_report: SkipValidation[dict[str, Any]]
+    stats: SkipValidation[dict[str, Any]]
 
 
-class Step6BatchResponse(BaseModel):
+class Step6BatchResponse(WorkflowResponseBase):
     """步骤6：批量质量检查响应"""
 
     novel_id: int
     workflow_status: str
     total_chapters: int
-    results: list[dict[str, Any]]
+    results: SkipValidation[list[BatchItemPayload]]
 
 
-class ConsistencyCheckResponse(BaseModel):
+class ConsistencyCheckResponse(WorkflowResponseBase):
     """一致性检查响应"""
 
     novel_id: int
@@ -164,12 +244,12 @@ class ConsistencyCheckResponse(BaseModel):
     chapter_title: str
     overall_risk: str
     summary: str = ""
-    issues: list[dict[str, Any]]
-    usage: dict[str, Any]
+    issues: SkipValidation[list[IssuePayload]]
+    usage: SkipValidation[dict[str, Any]]
     cost: float
 
 
-class ChapterRewriteResponse(BaseModel):
+class ChapterRewriteResponse(WorkflowResponseBase):
     """章节改写响应"""
 
     novel_id: int
@@ -186,12 +266,12 @@ class ChapterRewriteResponse(BaseModel):
     diff_summary: str
     saved: bool
     history_id: str
-    usage: dict[str, Any]
+    usage: SkipValidation[dict[str, Any]]
     cost: float
     model: Optional[str] = None
 
 
-class ChapterRollbackResponse(BaseModel):
+class ChapterRollbackResponse(WorkflowResponseBase):
     """章节改写回滚响应"""
 
     novel_id: int
@@ -214,18 +294,19 @@ class PipelineRunRequest(BaseModel):
     max_workers: int = Field(1, ge=1, le=16, description="并行线程数，1=串行，>1=多线程并行")
 
 
-class PipelineTaskResult(BaseModel):
-    """单章节任务结果"""
+@dataclass(frozen=True, slots=True)
+class PipelineTaskResult:
+    """单章节任务结果（纯输出结构，槽位化降低批量响应的单实例内存）"""
 
     chapter_id: int
     chapter_title: str
     step: int
     success: bool
     error: Optional[str] = None
-    stats: dict[str, Any] = {}
+    stats: SkipValidation[dict[str, Any]] = dataclasses.field(default_factory=dict)
 
 
-class PipelineRunResponse(BaseModel):
+class PipelineRunResponse(WorkflowResponseBase):
     """流水线运行响应"""
 
     novel_id: int
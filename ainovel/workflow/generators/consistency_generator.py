@@ -3,24 +3,41 @@
 
 对章节内容进行角色设定、世界观、时间线一致性检查。
 """
-import json
 import re
 from typing import Dict, Any, List, Optional
+
+import orjson
 from sqlalchemy.orm import Session
 
 from ainovel.llm.base import BaseLLMClient
-from ainovel.core.prompt_manager import PromptManager
+from ainovel.core.prompt_manager import get_prompt_manager
 from ainovel.core.context_compressor import ContextCompressor
 from ainovel.db.crud import chapter_crud
 from ainovel.memory import CharacterDatabase, WorldDatabase
 
+# 模块级预编译：避免每次解析的 re 缓存查找开销
+_JSON_FENCE_RE = re.compile(r"```json\s*(\{.*?\})\s*```", re.DOTALL)
+
+# 关键词分隔符：中英文逗号、顿号、分号，连带吃掉其后空白（单趟扫描即完成切分+去空白）
+_SPLIT_RE = re.compile(r"[，,、;；]\s*")
+
 
 class ConsistencyGenerator:
     """一致性检查生成器"""
 
     def __init__(self, llm_client: BaseLLMClient):
         self.llm_client = llm_client
-        self.prompt_manager = PromptManager()
+        self.prompt_manager = get_prompt_manager()
+        # 按 Session 复用压缩器实例，批量检查时不必逐章节重建
+        self._compressor: Optional[ContextCompressor] = None
+
+    def _get_compressor(self, session: Session) -> ContextCompressor:
+        """获取绑定当前 Session 的 ContextCompressor（同一 Session 内复用）"""
+        compressor = self._compressor
+        if compressor is None or compressor.session is not session:
+            compressor = ContextCompressor(self.llm_client, session)
+            self._compressor = compressor
+        return compressor
 
     def check_chapter(
         self,
@@ -42,14 +59,16 @@ class ConsistencyGenerator:
             strict: 是否启用严格模式
             temperature: 温度
             max_tokens: 最大token
+
+        注意：content / content_override 按 or 链取第一个非空值，
+        空字符串视同未提供，回落到下一候选。
         """
-        chapter = chapter_crud.get_by_id(session, chapter_id)
+        # 一次 JOIN 预加载分卷与小说，避免懒加载多次往返
+        chapter = chapter_crud.get_by_id_with_parents(session, chapter_id)
         if not chapter:
             raise ValueError(f"章节不存在: {chapter_id}")
 
-        chapter_content = content if content is not None else content_override
-        if chapter_content is None:
-            chapter_content = chapter.content
+        chapter_content = content or content_override or chapter.content
         if not chapter_content:
             raise ValueError(f"章节内容为空，无法检查: {chapter_id}")
 
@@ -72,7 +91,7 @@ class ConsistencyGenerator:
             limit=8,
         )
 
-        compressor = ContextCompressor(self.llm_client, session)
+        compressor = self._get_compressor(session)
         previous_context = compressor.build_previous_context(
             volume_id=volume.id,
             current_order=chapter.order,
@@ -113,19 +132,35 @@ class ConsistencyGenerator:
 
     def _parse_consistency_report(self, content: str) -> Dict[str, Any]:
         """解析一致性检查 JSON"""
-        json_match = re.search(r"```json\s*(\{.*?\})\s*```", content, re.DOTALL)
+        # 快路径：输出本身就是裸JSON或以 ```json 开头，直接切片解析，跳过正则
+        s = content.strip()
+        if s.startswith("{") and s.endswith("}"):
+            try:
+                return orjson.loads(s)
+            except orjson.JSONDecodeError:
+                pass
+        if s.startswith("```json"):
+            end = s.rfind("```")
+            if end > 7:
+                try:
+                    return orjson.loads(s[7:end].strip())
+                except orjson.JSONDecodeError:
+                    pass
+
+        json_match = _JSON_FENCE_RE.search(content)
         if json_match:
             json_str = json_match.group(1)
         else:
-            json_match = re.search(r"\{.*\}", content, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
+            # find/rfind 为 C 级扫描，避免长输出上的正则回溯
+            start, end = content.find("{"), content.rfind("}") + 1
+            if start != -1 and end > start:
+                json_str = content[start:end]
             else:
                 raise ValueError(f"无法从输出中提取JSON: {content[:200]}")
 
         try:
-            return json.loads(json_str)
-        except json.JSONDecodeError as e:
+            return orjson.loads(json_str)
+        except orjson.JSONDecodeError as e:
             raise ValueError(f"JSON解析失败: {e}")
 
     @staticmethod
@@ -134,34 +169,25 @@ class ConsistencyGenerator:
         if not chapter.characters_involved:
             return []
         try:
-            data = json.loads(chapter.characters_involved)
+            data = orjson.loads(chapter.characters_involved)
             if isinstance(data, list):
                 return [str(name) for name in data if str(name).strip()]
-        except (TypeError, json.JSONDecodeError):
+        except (TypeError, orjson.JSONDecodeError):
             return []
         return []
 
     @staticmethod
     def _extract_world_keywords(chapter) -> List[str]:
         """从关键事件和梗概提取世界观关键词（粗粒度）"""
-        keywords: List[str] = []
+        parts: List[str] = []
         if chapter.summary:
-            keywords.extend([part.strip() for part in chapter.summary.split("，") if part.strip()])
+            parts += _SPLIT_RE.split(chapter.summary.strip())
         if chapter.key_events:
             try:
-                events = json.loads(chapter.key_events)
+                events = orjson.loads(chapter.key_events)
                 if isinstance(events, list):
-                    keywords.extend([str(e).strip() for e in events if str(e).strip()])
-            except (TypeError, json.JSONDecodeError):
+                    parts += map(str, events)
+            except (TypeError, orjson.JSONDecodeError):
                 pass
-        # 去重并控制长度
-        dedup = []
-        seen = set()
-        for kw in keywords:
-            short_kw = kw[:20]
-            if short_kw and short_kw not in seen:
-                seen.add(short_kw)
-                dedup.append(short_kw)
-            if len(dedup) >= 12:
-                break
-        return dedup
+        # dict.fromkeys 在 C 层单趟完成保序去重，省去 seen/append 的逐元素开销
+        return list(dict.fromkeys(p.strip()[:20] for p in parts if p and p.strip()))[:12]
@@ -3,14 +3,25 @@
 
 步骤4：根据大纲为每个章节生成详细细纲
 """
-import json
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+import orjson
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from ainovel.llm.base import BaseLLMClient
-from ainovel.core.prompt_manager import PromptManager
+from ainovel.core.prompt_manager import get_prompt_manager
 from ainovel.db.crud import chapter_crud
+from ainovel.cache.llm_cache import (
+    DETAIL_OUTLINE_PROMPT_VERSION,
+    make_prompt_key,
+    get_cached_response,
+    put_cached_response,
+)
+
+# 模块级预编译：避免每次解析的 re 缓存查找开销
+_JSON_FENCE_RE = re.compile(r"```json\s*(\{.*?\})\s*```", re.DOTALL)
 
 
 class DetailOutlineGenerator:
@@ -24,7 +35,13 @@ class DetailOutlineGenerator:
             llm_client: LLM客户端
         """
         self.llm_client = llm_client
-        self.prompt_manager = PromptManager()
+        self.prompt_manager = get_prompt_manager()
+        # 按小说缓存世界观数据：批量生成时百余章节返回同一批行，只查一次。
+        # 生成器随编排器按请求创建，缓存生命周期即一次请求/流水线运行。
+        self._world_data_cache: Dict[int, List[Dict[str, Any]]] = {}
+        # 按小说缓存全量角色信息：批量生成时角色表只查一次，
+        # 逐章按名字在字典中命中，免去每章一条 IN 查询
+        self._character_map_cache: Dict[int, Dict[str, Dict[str, Any]]] = {}
 
     def generate_detail_outline(
         self,
@@ -32,6 +49,7 @@ class DetailOutlineGenerator:
         chapter_id: int,
         temperature: float = 0.7,
         max_tokens: int = 3000,
+        commit: bool = True,
     ) -> Dict[str, Any]:
         """
         为指定章节生成详细细纲
@@ -41,6 +59,8 @@ class DetailOutlineGenerator:
             chapter_id: 章节ID
             temperature: 温度参数
             max_tokens: 最大token数
+            commit: 缓存写入是否立即提交；批量共享会话时传 False，
+                随批末尾的统一 commit 落盘
 
         Returns:
             包含细纲和元数据的字典
@@ -54,8 +74,8 @@ class DetailOutlineGenerator:
         Raises:
             ValueError: 章节不存在或数据不完整
         """
-        # 获取章节信息
-        chapter = chapter_crud.get_by_id(session, chapter_id)
+        # 获取章节信息（一次 JOIN 预加载分卷与小说，避免懒加载多次往返）
+        chapter = chapter_crud.get_by_id_with_parents(session, chapter_id)
         if not chapter:
             raise ValueError(f"章节不存在: {chapter_id}")
 
@@ -64,9 +84,9 @@ class DetailOutlineGenerator:
 
         # 解析章节大纲信息
         summary = chapter.summary or "暂无梗概"
-        key_events = json.loads(chapter.key_events) if chapter.key_events else []
+        key_events = orjson.loads(chapter.key_events) if chapter.key_events else []
         characters_involved = (
-            json.loads(chapter.characters_involved) if chapter.characters_involved else []
+            orjson.loads(chapter.characters_involved) if chapter.characters_involved else []
         )
 
         # 获取涉及角色的详细信息
@@ -78,8 +98,8 @@ class DetailOutlineGenerator:
         # 获取前情回顾（前N章内容）
         previous_context = self._get_previous_context(session, chapter)
 
-        # 生成提示词
-        prompt = self.prompt_manager.generate_detail_outline_prompt(
+        # 生成提示词：静态设计原则前缀 + 动态章节内容
+        static_part, dynamic_part = self.prompt_manager.generate_detail_outline_prompt_parts(
             title=novel.title,
             volume_title=volume.title,
             chapter_order=chapter.order,
@@ -91,9 +111,41 @@ class DetailOutlineGenerator:
             previous_context=previous_context,
         )
 
+        # 提示词哈希缓存：输入未变更的重跑直接复用上次细纲
+        # （键按拼接后的完整提示词计算，与发送形式无关）
+        cache_key = make_prompt_key(
+            static_part + dynamic_part,
+            getattr(self.llm_client, "model", "") or "",
+            DETAIL_OUTLINE_PROMPT_VERSION,
+        )
+        cached_outline = get_cached_response(session, cache_key)
+        if cached_outline is not None:
+            return {
+                "detail_outline": cached_outline,
+                "usage": {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0},
+                "cost": 0,
+                "raw_content": "",
+                "parse_failed": False,
+                "outline_json": orjson.dumps(
+                    cached_outline, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                ).decode(),
+                "cached": True,
+            }
+
+        # 支持显式前缀缓存的客户端（如 Claude）：静态原则块标记 cache_control，
+        # 批量生成时原则部分命中缓存；其他客户端发送拼接串，
+        # 字节恒定的前缀仍可命中提供商的自动 prefix cache
+        if self.llm_client.supports_prompt_caching():
+            content: Any = [
+                {"type": "text", "text": static_part, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": dynamic_part},
+            ]
+        else:
+            content = static_part + dynamic_part
+
         # 调用LLM
         response = self.llm_client.generate(
-            messages=[{"role": "user", "content": prompt}],
+            messages=[{"role": "user", "content": content}],
             temperature=temperature,
             max_tokens=max_tokens,
         )
@@ -101,7 +153,17 @@ class DetailOutlineGenerator:
         raw_content = response["content"]
 
         # 解析JSON，失败时返回空结构并标记
-        detail_outline_data, parse_failed = self._parse_detail_outline(raw_content)
+        detail_outline_data, parse_failed, outline_json = self._parse_detail_outline(raw_content)
+
+        # 解析成功才入缓存，失败结果不缓存（下次重试）
+        if not parse_failed:
+            put_cached_response(
+                session,
+                cache_key,
+                detail_outline_data,
+                prompt_version=DETAIL_OUTLINE_PROMPT_VERSION,
+                commit=commit,
+            )
 
         return {
             "detail_outline": detail_outline_data,
@@ -109,10 +171,16 @@ class DetailOutlineGenerator:
             "cost": response.get("cost", 0),
             "raw_content": raw_content,
             "parse_failed": parse_failed,
+            "outline_json": outline_json,
         }
 
     def save_detail_outline(
-        self, session: Session, chapter_id: int, detail_outline: Dict[str, Any]
+        self,
+        session: Session,
+        chapter_id: int,
+        detail_outline: Dict[str, Any],
+        outline_json: Optional[str] = None,
+        commit: bool = True,
     ) -> Dict[str, Any]:
         """
         保存细纲到章节
@@ -121,6 +189,8 @@ class DetailOutlineGenerator:
             session: 数据库会话
             chapter_id: 章节ID
             detail_outline: 细纲数据
+            outline_json: 细纲对应的原始JSON文本；提供时直接入库，省去一次重新序列化
+            commit: 是否立即提交；批量共享会话时传 False，由调用方统一提交
 
         Returns:
             保存统计信息
@@ -130,11 +200,16 @@ class DetailOutlineGenerator:
             raise ValueError(f"章节不存在: {chapter_id}")
 
         # 将细纲保存为JSON字符串；解析失败时直接存原始文本供用户编辑
-        if isinstance(detail_outline, dict):
-            chapter.detail_outline = json.dumps(detail_outline, ensure_ascii=False, indent=2)
+        if outline_json is not None and isinstance(detail_outline, dict):
+            chapter.detail_outline = outline_json
+        elif isinstance(detail_outline, dict):
+            chapter.detail_outline = orjson.dumps(
+                detail_outline, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ).decode()
         else:
             chapter.detail_outline = str(detail_outline)
-        session.commit()
+        if commit:
+            session.commit()
 
         return {
             "chapter_id": chapter_id,
@@ -147,6 +222,7 @@ class DetailOutlineGenerator:
         chapter_id: int,
         temperature: float = 0.7,
         max_tokens: int = 3000,
+        commit: bool = True,
     ) -> Dict[str, Any]:
         """
         生成并保存细纲（一步完成）
@@ -156,6 +232,7 @@ class DetailOutlineGenerator:
             chapter_id: 章节ID
             temperature: 温度参数
             max_tokens: 最大token数
+            commit: 是否逐章提交；批量共享会话时传 False
 
         Returns:
             生成结果和保存统计
@@ -165,12 +242,18 @@ class DetailOutlineGenerator:
             chapter_id=chapter_id,
             temperature=temperature,
             max_tokens=max_tokens,
+            commit=commit,
         )
 
-        # 解析失败时用原始文本代替空dict入库
+        # 解析失败时用原始文本代替空dict入库；
+        # 成功时直接复用解析阶段截取的JSON子串，避免二次序列化
         outline_to_save = result["raw_content"] if result["parse_failed"] else result["detail_outline"]
         stats = self.save_detail_outline(
-            session=session, chapter_id=chapter_id, detail_outline=outline_to_save
+            session=session,
+            chapter_id=chapter_id,
+            detail_outline=outline_to_save,
+            outline_json=None if result["parse_failed"] else result["outline_json"],
+            commit=commit,
         )
 
         result["stats"] = stats
@@ -179,62 +262,97 @@ class DetailOutlineGenerator:
     def _get_character_info(
         self, session: Session, novel_id: int, character_names: List[str]
     ) -> List[Dict[str, Any]]:
-        """获取角色详细信息"""
-        from ainovel.memory.crud import character_crud
-
-        characters = []
-        for name in character_names:
-            char = character_crud.get_by_name(session, novel_id, name)
-            if char:
-                characters.append(
-                    {
-                        "name": char.name,
-                        "mbti": char.mbti.value,
-                        "background": char.background,
-                        "personality_traits": char.personality_traits,
-                        "memories": char.memories,
-                    }
-                )
-        return characters
+        """获取角色详细信息（按传入名字顺序，从小说级角色字典命中）"""
+        if not character_names:
+            return []
+
+        character_map = self._get_character_map(session, novel_id)
+        return [character_map[name] for name in character_names if name in character_map]
+
+    def _get_character_map(
+        self, session: Session, novel_id: int
+    ) -> Dict[str, Dict[str, Any]]:
+        """获取全量角色信息字典（同一小说只查一次，后续命中缓存）"""
+        from ainovel.memory.character import Character
+
+        cached = self._character_map_cache.get(novel_id)
+        if cached is not None:
+            return cached
+
+        # 只投影提示词所需的五列，Row 元组不做 ORM 水合
+        stmt = select(
+            Character.name,
+            Character.mbti,
+            Character.background,
+            Character.personality_traits,
+            Character.memories,
+        ).where(Character.novel_id == novel_id)
+        result = {
+            row.name: {
+                "name": row.name,
+                "mbti": row.mbti.value,
+                "background": row.background,
+                "personality_traits": row.personality_traits,
+                "memories": row.memories,
+            }
+            for row in session.execute(stmt)
+        }
+        self._character_map_cache[novel_id] = result
+        return result
 
     def _get_world_data(self, session: Session, novel_id: int) -> List[Dict[str, Any]]:
-        """获取世界观数据"""
+        """获取世界观数据（同一小说只查一次，后续命中缓存）"""
         from ainovel.memory.crud import world_data_crud
 
-        world_data_list = world_data_crud.get_by_novel_id(session, novel_id)
-        return [
+        cached = self._world_data_cache.get(novel_id)
+        if cached is not None:
+            return cached
+
+        # 只投影三列，Row 元组不做 ORM 水合
+        WorldData = world_data_crud.model
+        stmt = (
+            select(WorldData.data_type, WorldData.name, WorldData.description)
+            .where(WorldData.novel_id == novel_id)
+            .order_by(WorldData.data_type, WorldData.name)
+        )
+        result = [
             {
-                "data_type": wd.data_type.value,
-                "title": wd.name,
-                "content": wd.description,
+                "data_type": data_type.value,
+                "title": name,
+                "content": description,
             }
-            for wd in world_data_list
+            for data_type, name, description in session.execute(stmt)
         ]
+        self._world_data_cache[novel_id] = result
+        return result
 
     def _get_previous_context(self, session: Session, chapter) -> str:
         """获取前情回顾（前N章的概要）"""
-        # 获取同一分卷中前面的章节
-        previous_chapters = (
-            session.query(chapter_crud.model)
-            .filter(
-                chapter_crud.model.volume_id == chapter.volume_id,
-                chapter_crud.model.order < chapter.order,
+        # Core select 只投影三个字段，返回轻量 Row 元组，
+        # 不做 ORM 对象水合、不进身份映射
+        Chapter = chapter_crud.model
+        stmt = (
+            select(Chapter.order, Chapter.title, Chapter.summary)
+            .where(
+                Chapter.volume_id == chapter.volume_id,
+                Chapter.order < chapter.order,
             )
-            .order_by(chapter_crud.model.order.desc())
+            .order_by(Chapter.order.desc())
             .limit(3)
-            .all()
         )
+        previous_chapters = session.execute(stmt).all()
 
         if not previous_chapters:
             return "本章为开篇，无前情"
 
-        context_parts = []
-        for ch in reversed(previous_chapters):
-            context_parts.append(f"第{ch.order}章 {ch.title}: {ch.summary or '暂无概要'}")
-
-        return "\n".join(context_parts)
+        return "\n".join(
+            f"第{order}章 {title}: {summary or '暂无概要'}"
+            for order, title, summary in reversed(previous_chapters)
+        )
 
-    def _parse_detail_outline(self, content: str) -> tuple[Dict[str, Any], bool]:
+    def _parse_detail_outline(
+        self, content: str
+    ) -> tuple[Dict[str, Any], bool, Optional[str]]:
         """
         解析LLM输出的细纲JSON
 
@@ -242,23 +360,41 @@ class DetailOutlineGenerator:
             content: LLM输出内容
 
         Returns:
-            (detail_outline_data, parse_failed)
+            (detail_outline_data, parse_failed, json_str)
+            json_str 为截取到的原始JSON文本，供保存时直接复用；
             解析失败时返回空结构和 parse_failed=True，不抛异常
         """
+        # 快路径：输出本身就是裸JSON或以 ```json 开头（表现良好的模型占绝大多数），
+        # 直接切片解析，跳过正则
+        s = content.strip()
+        if s.startswith("{") and s.endswith("}"):
+            try:
+                return orjson.loads(s), False, s
+            except orjson.JSONDecodeError:
+                pass
+        if s.startswith("```json"):
+            end = s.rfind("```")
+            if end > 7:
+                candidate = s[7:end].strip()
+                try:
+                    return orjson.loads(candidate), False, candidate
+                except orjson.JSONDecodeError:
+                    pass
+
         # 尝试提取JSON代码块
-        json_match = re.search(r"```json\s*(\{.*?\})\s*```", content, re.DOTALL)
+        json_match = _JSON_FENCE_RE.search(content)
         if json_match:
             json_str = json_match.group(1)
         else:
-            # 尝试直接查找JSON对象
-            json_match = re.search(r"\{.*\}", content, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
+            # 尝试直接查找JSON对象（find/rfind 为 C 级扫描，避免长输出上的正则回溯）
+            start, end = content.find("{"), content.rfind("}") + 1
+            if start != -1 and end > start:
+                json_str = content[start:end]
             else:
-                return {"scenes": []}, True
+                return {"scenes": []}, True, None
 
         try:
-            detail_outline_data = json.loads(json_str)
-            return detail_outline_data, False
-        except json.JSONDecodeError:
-            return {"scenes": []}, True
+            detail_outline_data = orjson.loads(json_str)
+            return detail_outline_data, False, json_str
+        except orjson.JSONDecodeError:
+            return {"scenes": []}, True, None
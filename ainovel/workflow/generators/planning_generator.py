@@ -8,7 +8,7 @@ from typing import Dict, Any
 from loguru import logger
 
 from ainovel.llm.base import BaseLLMClient
-from ainovel.core.prompt_manager import PromptManager
+from ainovel.core.prompt_manager import get_prompt_manager
 
 
 class PlanningGenerator:
@@ -22,7 +22,7 @@ class PlanningGenerator:
             llm_client: LLM客户端
         """
         self.llm_client = llm_client
-        self.prompt_manager = PromptManager()
+        self.prompt_manager = get_prompt_manager()
 
     def generate_planning(
         self,
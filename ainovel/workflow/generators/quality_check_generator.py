@@ -3,14 +3,25 @@
 
 步骤6：对已生成的章节内容进行多维度质量检查，识别问题并给出修改建议
 """
-import json
 import re
-from typing import Dict, Any, List
-from sqlalchemy.orm import Session
+import orjson
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
 
 from ainovel.llm.base import BaseLLMClient
-from ainovel.core.prompt_manager import PromptManager
+from ainovel.core.prompt_manager import get_prompt_manager
 from ainovel.db.crud import chapter_crud
+from ainovel.cache.llm_cache import (
+    make_quality_check_key,
+    get_cached_response,
+    put_cached_response,
+)
+from ainovel.utils.json_extract import find_json_object, IncrementalJSONScanner
+
+# 模块级预编译：避免每次解析的 re 缓存查找开销
+_JSON_FENCE_RE = re.compile(r"```json\s*(\{.*?\})\s*```", re.DOTALL)
 
 
 class QualityCheckGenerator:
@@ -24,7 +35,7 @@ class QualityCheckGenerator:
             llm_client: LLM客户端
         """
         self.llm_client = llm_client
-        self.prompt_manager = PromptManager()
+        self.prompt_manager = get_prompt_manager()
 
     def check_chapter(
         self,
@@ -32,6 +43,8 @@ class QualityCheckGenerator:
         chapter_id: int,
         temperature: float = 0.3,
         max_tokens: int = 3000,
+        character_list: Optional[List[Dict[str, Any]]] = None,
+        previous_context: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         对指定章节进行质量检查
@@ -41,6 +54,8 @@ class QualityCheckGenerator:
             chapter_id: 章节ID
             temperature: 温度参数（低温度保证检查结果稳定）
             max_tokens: 最大token数
+            character_list: 预取的角色信息（批量检查时传入，省去逐章查询）
+            previous_context: 预取的前情回顾（批量检查时传入，省去逐章查询）
 
         Returns:
             包含检查结果和元数据的字典
@@ -64,17 +79,31 @@ class QualityCheckGenerator:
         volume = chapter.volume
         novel = volume.novel
 
-        # 获取涉及角色的详细信息
-        characters_involved = (
-            json.loads(chapter.characters_involved) if chapter.characters_involved else []
-        )
-        character_list = self._get_character_info(session, novel.id, characters_involved)
+        # 获取涉及角色的详细信息（批量路径已预取，单章路径逐章查询）
+        if character_list is None:
+            character_list = self._get_character_info(
+                session, novel.id, chapter.characters_involved_list
+            )
 
         # 获取前情回顾（用于检查连贯性）
-        previous_context = self._get_previous_context(session, chapter)
+        if previous_context is None:
+            previous_context = self._get_previous_context(session, chapter)
+
+        # 内容哈希缓存：章节内容/角色信息/前情未变更时直接复用上次报告
+        cache_key = make_quality_check_key(chapter.content, character_list, previous_context)
+        cached_report = get_cached_response(session, cache_key)
+        if cached_report is not None:
+            return {
+                "quality_report": cached_report,
+                "usage": {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0},
+                "cost": 0,
+                "raw_content": "",
+                "parse_failed": False,
+                "cached": True,
+            }
 
-        # 生成提示词
-        prompt = self.prompt_manager.generate_quality_check_prompt(
+        # 生成提示词：静态规则前缀 + 动态章节内容
+        static_part, dynamic_part = self.prompt_manager.generate_quality_check_prompt_parts(
             title=novel.title,
             volume_title=volume.title,
             chapter_order=chapter.order,
@@ -85,17 +114,41 @@ class QualityCheckGenerator:
             previous_context=previous_context,
         )
 
-        # 调用LLM
-        response = self.llm_client.generate(
-            messages=[{"role": "user", "content": prompt}],
+        # 支持显式前缀缓存的客户端（如 Claude）：静态规则块标记 cache_control，
+        # 批量检查时规则部分命中缓存；其他客户端发送拼接串，
+        # 字节恒定的前缀仍可命中提供商的自动 prefix cache
+        if self.llm_client.supports_prompt_caching():
+            content: Any = [
+                {"type": "text", "text": static_part, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": dynamic_part},
+            ]
+        else:
+            content = static_part + dynamic_part
+
+        # 流式调用LLM：增量扫描器边收边配平括号，
+        # 最后一个 } 到达时 JSON 子串已就绪，解析不占关键路径
+        scanner = IncrementalJSONScanner()
+        response = self.llm_client.generate_stream(
+            messages=[{"role": "user", "content": content}],
+            on_delta=scanner.feed,
             temperature=temperature,
             max_tokens=max_tokens,
         )
 
         raw_content = response["content"]
 
-        # 解析JSON，失败时返回空结构并标记
-        quality_report, parse_failed = self._parse_quality_report(raw_content)
+        # 优先用扫描器定位的对象，异常时回退整段解析
+        if scanner.result is not None:
+            try:
+                quality_report, parse_failed = orjson.loads(scanner.result), False
+            except orjson.JSONDecodeError:
+                quality_report, parse_failed = self._parse_quality_report(raw_content)
+        else:
+            quality_report, parse_failed = self._parse_quality_report(raw_content)
+
+        # 解析成功才入缓存，失败结果不缓存（下次重试）
+        if not parse_failed:
+            put_cached_response(session, cache_key, quality_report)
 
         return {
             "quality_report": quality_report,
@@ -103,6 +156,7 @@ class QualityCheckGenerator:
             "cost": response.get("cost", 0),
             "raw_content": raw_content,
             "parse_failed": parse_failed,
+            "cached": False,
         }
 
     def save_quality_report(
@@ -125,10 +179,16 @@ class QualityCheckGenerator:
 
         # 解析失败时直接存原始文本供用户编辑
         if isinstance(quality_report, dict):
-            chapter.quality_report = json.dumps(quality_report, ensure_ascii=False, indent=2)
+            new_text = orjson.dumps(
+                quality_report, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ).decode()
         else:
-            chapter.quality_report = str(quality_report)
-        session.commit()
+            new_text = str(quality_report)
+
+        # 幂等重跑时报告未变化则跳过写入，省去 10-50KB 的无效 UPDATE
+        if chapter.quality_report != new_text:
+            chapter.quality_report = new_text
+            session.commit()
 
         # 统计问题数量
         issues = quality_report.get("issues", []) if isinstance(quality_report, dict) else []
@@ -147,6 +207,8 @@ class QualityCheckGenerator:
         chapter_id: int,
         temperature: float = 0.3,
         max_tokens: int = 3000,
+        character_list: Optional[List[Dict[str, Any]]] = None,
+        previous_context: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         检查并保存质量报告（一步完成）
@@ -156,6 +218,8 @@ class QualityCheckGenerator:
             chapter_id: 章节ID
             temperature: 温度参数
             max_tokens: 最大token数
+            character_list: 预取的角色信息（批量检查时传入）
+            previous_context: 预取的前情回顾（批量检查时传入）
 
         Returns:
             检查结果和保存统计
@@ -165,6 +229,8 @@ class QualityCheckGenerator:
             chapter_id=chapter_id,
             temperature=temperature,
             max_tokens=max_tokens,
+            character_list=character_list,
+            previous_context=previous_context,
         )
 
         # 解析失败时用原始文本代替空dict入库
@@ -179,53 +245,149 @@ class QualityCheckGenerator:
         return result
 
     def batch_check(
-        self, session: Session, novel_id: int
+        self, session: Session, novel_id: int, max_workers: int = 1
     ) -> Dict[str, Any]:
         """
         批量检查小说所有已生成章节
 
+        LLM 调用为网络 I/O 密集型（socket 等待期间释放 GIL），
+        max_workers > 1 时用线程池并发各章节，每个线程持有独立
+        Session（Session 不可跨线程共享）；save_quality_report 的
+        单次 commit 在各自线程的会话内完成，互不干扰。
+        Web 层并发度由 AINOVEL_BATCH_CONCURRENCY 环境变量控制。
+
         Args:
             session: 数据库会话
             novel_id: 小说ID
+            max_workers: 并发线程数，1 表示串行
 
         Returns:
             批量检查结果
         """
-        from ainovel.db.crud import novel_crud
-
-        novel = novel_crud.get_by_id(session, novel_id)
+        from ainovel.db.database import get_database
+        from ainovel.db.novel import Novel
+        from ainovel.db.volume import Volume
+
+        # 一次性预加载全部卷/章，消除逐章的 lazy-load 往返
+        novel = (
+            session.query(Novel)
+            .options(selectinload(Novel.volumes).selectinload(Volume.chapters))
+            .filter(Novel.id == novel_id)
+            .first()
+        )
         if not novel:
             raise ValueError(f"小说不存在: {novel_id}")
 
-        # 收集所有有内容的章节
+        # 全书角色一次取齐，后续按名字字典命中
+        character_map = self._get_all_character_info(session, novel_id)
+
+        # 收集所有有内容的章节，并在内存中组装前情回顾与角色信息
         chapters_with_content = []
+        prefetched: Dict[int, Dict[str, Any]] = {}
         for volume in novel.volumes:
-            for chapter in volume.chapters:
-                if chapter.content:
-                    chapters_with_content.append(chapter)
+            # 章节已由关系 order_by 在 SQL 层排好序
+            siblings = volume.chapters
+            for idx, chapter in enumerate(siblings):
+                if not chapter.content:
+                    continue
+                chapters_with_content.append(chapter)
+                names = chapter.characters_involved_list
+                character_list = [
+                    character_map[n] for n in names if n in character_map
+                ]
+                previous_context = self._previous_context_from_list(siblings, idx)
+                prefetched[chapter.id] = {
+                    "character_list": character_list,
+                    "previous_context": previous_context,
+                    "cache_key": make_quality_check_key(
+                        chapter.content, character_list, previous_context
+                    ),
+                }
 
         if not chapters_with_content:
             raise ValueError("没有已生成内容的章节可供检查")
 
-        results = []
-        for chapter in chapters_with_content:
+        def _check_one(chapter_id: int, chapter_title: str, work_session: Session) -> Dict[str, Any]:
             try:
-                result = self.check_and_save(session=session, chapter_id=chapter.id)
-                results.append({
-                    "chapter_id": chapter.id,
-                    "chapter_title": chapter.title,
+                pre = prefetched[chapter_id]
+                result = self.check_and_save(
+                    session=work_session,
+                    chapter_id=chapter_id,
+                    character_list=pre["character_list"],
+                    previous_context=pre["previous_context"],
+                )
+                return {
+                    "chapter_id": chapter_id,
+                    "chapter_title": chapter_title,
                     "success": True,
                     "overall_score": result["stats"]["overall_score"],
                     "issues_count": result["stats"]["issues_count"],
                     "critical_issues": result["stats"]["critical_issues"],
-                })
+                }
             except Exception as e:
-                results.append({
-                    "chapter_id": chapter.id,
-                    "chapter_title": chapter.title,
+                return {
+                    "chapter_id": chapter_id,
+                    "chapter_title": chapter_title,
                     "success": False,
                     "error": str(e),
-                })
+                }
+
+        chapter_infos = [(chapter.id, chapter.title) for chapter in chapters_with_content]
+
+        # 同批内提示词去重：相同缓存键的章节只有首个真正调用 LLM，
+        # 其余排到第二阶段，届时内容哈希缓存已写入、直接命中
+        seen_keys: set = set()
+        primary_infos = []
+        duplicate_infos = []
+        for cid, ctitle in chapter_infos:
+            key = prefetched[cid]["cache_key"]
+            if key in seen_keys:
+                duplicate_infos.append((cid, ctitle))
+            else:
+                seen_keys.add(key)
+                primary_infos.append((cid, ctitle))
+
+        result_map: Dict[int, Dict[str, Any]] = {}
+        if max_workers <= 1:
+            for cid, ctitle in primary_infos:
+                result_map[cid] = _check_one(cid, ctitle, session)
+        else:
+
+            def _worker(chapter_id: int, chapter_title: str) -> Dict[str, Any]:
+                db = get_database()
+                work_session = db.get_session()
+                try:
+                    return _check_one(chapter_id, chapter_title, work_session)
+                finally:
+                    work_session.close()
+
+            title_by_id = dict(chapter_infos)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                future_map = {
+                    executor.submit(_worker, cid, ctitle): cid
+                    for cid, ctitle in primary_infos
+                }
+                for future in as_completed(future_map):
+                    cid = future_map[future]
+                    try:
+                        item = future.result()
+                    except Exception as e:
+                        # 工作线程在 _check_one 之外失败（如会话获取），
+                        # 记为该章节的错误，不中断其余在途章节
+                        item = {
+                            "chapter_id": cid,
+                            "chapter_title": title_by_id[cid],
+                            "success": False,
+                            "error": str(e),
+                        }
+                    result_map[cid] = item
+
+        # 第二阶段：重复提示词的章节串行走缓存命中路径
+        for cid, ctitle in duplicate_infos:
+            result_map[cid] = _check_one(cid, ctitle, session)
+
+        # 按章节原始顺序组装结果
+        results = [result_map[cid] for cid, _ in chapter_infos]
 
         return {
             "novel_id": novel_id,
@@ -236,21 +398,63 @@ class QualityCheckGenerator:
     def _get_character_info(
         self, session: Session, novel_id: int, character_names: List[str]
     ) -> List[Dict[str, Any]]:
-        """获取角色详细信息"""
+        """获取角色详细信息（单条 IN 查询，按传入名字顺序返回）"""
         from ainovel.memory.crud import character_crud
 
-        characters = []
-        for name in character_names:
-            char = character_crud.get_by_name(session, novel_id, name)
-            if char:
-                characters.append({
-                    "name": char.name,
-                    "mbti": char.mbti.value,
-                    "background": char.background,
-                    "personality_traits": char.personality_traits,
-                    "memories": char.memories,
-                })
-        return characters
+        found = {
+            char.name: char
+            for char in character_crud.get_by_names(session, novel_id, character_names)
+        }
+        return [
+            {
+                "name": char.name,
+                "mbti": char.mbti.value,
+                "background": char.background,
+                "personality_traits": char.personality_traits,
+                "memories": char.memories,
+            }
+            for name in character_names
+            if (char := found.get(name)) is not None
+        ]
+
+    def _get_all_character_info(
+        self, session: Session, novel_id: int
+    ) -> Dict[str, Dict[str, Any]]:
+        """一次查询取回全书角色信息，按名字索引（批量检查用）"""
+        from ainovel.memory.character import Character
+
+        rows = session.execute(
+            select(
+                Character.name,
+                Character.mbti,
+                Character.background,
+                Character.personality_traits,
+                Character.memories,
+            ).where(Character.novel_id == novel_id)
+        ).all()
+        return {
+            row.name: {
+                "name": row.name,
+                "mbti": row.mbti.value,
+                "background": row.background,
+                "personality_traits": row.personality_traits,
+                "memories": row.memories,
+            }
+            for row in rows
+        }
+
+    @staticmethod
+    def _previous_context_from_list(siblings: List, idx: int) -> str:
+        """从内存中的同卷章节列表组装前情回顾（前3章概要），不触发 DB 查询"""
+        previous_chapters = siblings[max(0, idx - 3): idx]
+        if not previous_chapters:
+            return "本章为开篇，无前情"
+
+        context_parts = []
+        for ch in previous_chapters:
+            context_parts.append(f"第{ch.order}章 {ch.title}: {ch.summary or '暂无概要'}")
+
+        return "\n".join(context_parts)
 
     def _get_previous_context(self, session: Session, chapter) -> str:
         """获取前情回顾（前N章的概要）"""
@@ -282,17 +486,16 @@ class QualityCheckGenerator:
             (quality_report, parse_failed)
             解析失败时返回空结构和 parse_failed=True，不抛异常
         """
-        json_match = re.search(r"```json\s*(\{.*?\})\s*```", content, re.DOTALL)
+        json_match = _JSON_FENCE_RE.search(content)
         if json_match:
             json_str = json_match.group(1)
         else:
-            json_match = re.search(r"\{.*\}", content, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
-            else:
+            # 线性括号深度扫描，避免贪婪正则在大输出上的回溯
+            json_str = find_json_object(content)
+            if json_str is None:
                 return {"issues": [], "overall_score": 0}, True
 
         try:
-            return json.loads(json_str), False
-        except json.JSONDecodeError:
+            return orjson.loads(json_str), False
+        except orjson.JSONDecodeError:
             return {"issues": [], "overall_score": 0}, True
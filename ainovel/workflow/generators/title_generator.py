@@ -3,27 +3,30 @@
 
 KB2 v5.0 第十一步：为小说生成最具吸引力的书名候选和黄金结构简介
 """
-import json
 import re
+import orjson
 from typing import Dict, Any
 
 from loguru import logger
 
 from ainovel.llm.base import BaseLLMClient
-from ainovel.core.prompt_manager import PromptManager
+from ainovel.core.prompt_manager import get_prompt_manager
+from ainovel.utils.json_extract import find_json_object
+
+# 模块级预编译：避免每次解析的 re 缓存查找开销
+_JSON_FENCE_RE = re.compile(r"```json\s*([\s\S]+?)\s*```")
 
 
 def _extract_json(raw: str) -> Dict[str, Any]:
     """从 LLM 输出中提取 JSON 对象"""
     # 优先匹配 ```json ... ``` 代码块
-    match = re.search(r"```json\s*([\s\S]+?)\s*```", raw)
+    match = _JSON_FENCE_RE.search(raw)
     if match:
-        return json.loads(match.group(1))
-    # 降级：直接尝试解析整段
-    start = raw.find("{")
-    end = raw.rfind("}") + 1
-    if start != -1 and end > start:
-        return json.loads(raw[start:end])
+        return orjson.loads(match.group(1))
+    # 降级：括号深度扫描定位第一个配平的 JSON 对象
+    json_str = find_json_object(raw)
+    if json_str is not None:
+        return orjson.loads(json_str)
     raise ValueError("无法从 LLM 输出中提取 JSON")
 
 
@@ -32,7 +35,7 @@ class TitleSynopsisGenerator:
 
     def __init__(self, llm_client: BaseLLMClient):
         self.llm_client = llm_client
-        self.prompt_manager = PromptManager()
+        self.prompt_manager = get_prompt_manager()
 
     def generate(
         self,
@@ -85,11 +88,14 @@ class TitleSynopsisGenerator:
         )
 
         raw_content = response.get("content") or ""
-        logger.debug(f"书名简介生成原始输出(前300字符): {raw_content[:300]}")
+        # lazy=True：debug 未启用时跳过切片与格式化
+        logger.opt(lazy=True).debug(
+            "书名简介生成原始输出(前300字符): {}", lambda: raw_content[:300]
+        )
 
         try:
             data = _extract_json(raw_content)
-        except (json.JSONDecodeError, ValueError) as e:
+        except (orjson.JSONDecodeError, ValueError) as e:
             logger.warning(f"JSON 解析失败，返回原始内容: {e}")
             data = {"raw": raw_content}
 
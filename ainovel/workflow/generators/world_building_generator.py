@@ -3,18 +3,35 @@
 
 步骤2：根据创作思路生成完整的世界背景和主要角色
 """
-import json
 import re
+import orjson
 from typing import Dict, Any, List
 from sqlalchemy import delete
 from sqlalchemy.orm import Session
 
 from ainovel.llm.base import BaseLLMClient
-from ainovel.core.prompt_manager import PromptManager
+from ainovel.core.prompt_manager import get_prompt_manager
 from ainovel.memory.character_db import CharacterDatabase
 from ainovel.memory.world_db import WorldDatabase
 from ainovel.memory.character import Character, MBTIType
 from ainovel.memory.world_data import WorldData, WorldDataType
+from ainovel.utils.json_extract import find_json_object
+
+# 模块级预编译：避免每次解析的 re 缓存查找开销
+_JSON_FENCE_RE = re.compile(r"```json\s*(\{.*?\})\s*```", re.DOTALL)
+
+# 名称 → 枚举成员映射（含大小写/首字母变体），导入期预建：
+# 内循环里一次字典命中取代 .upper() 临时串 + 枚举 __getitem__
+_TYPE_LOOKUP = {
+    name: t
+    for t in WorldDataType
+    for name in (t.name, t.name.lower(), t.name.title())
+}
+_MBTI_LOOKUP = {
+    name: m
+    for m in MBTIType
+    for name in (m.name, m.name.lower(), m.name.title())
+}
 
 
 class WorldBuildingGenerator:
@@ -37,7 +54,7 @@ class WorldBuildingGenerator:
         self.llm_client = llm_client
         self.character_db = character_db
         self.world_db = world_db
-        self.prompt_manager = PromptManager()
+        self.prompt_manager = get_prompt_manager()
 
     def generate_world_building(
         self,
@@ -113,57 +130,31 @@ class WorldBuildingGenerator:
         world_data_list = world_building_data.get("world_data", [])
         character_list = world_building_data.get("characters", [])
 
-        # 保存世界观数据
-        world_count = 0
+        # 保存世界观数据：一次遍历组装行，单条多行 INSERT 落库
+        world_rows = []
         for wd in world_data_list:
-            data_type_str = wd["data_type"].upper()
-            data_type = WorldDataType[data_type_str]
-            properties = wd.get("properties", {})
-
-            if data_type == WorldDataType.LOCATION:
-                self.world_db.create_location(
-                    novel_id=novel_id,
-                    name=wd["name"],
-                    description=wd["description"],
-                    **properties,
-                )
-            elif data_type == WorldDataType.ORGANIZATION:
-                self.world_db.create_organization(
-                    novel_id=novel_id,
-                    name=wd["name"],
-                    description=wd["description"],
-                    **properties,
-                )
-            elif data_type == WorldDataType.ITEM:
-                self.world_db.create_item(
-                    novel_id=novel_id,
-                    name=wd["name"],
-                    description=wd["description"],
-                    **properties,
-                )
-            elif data_type == WorldDataType.RULE:
-                self.world_db.create_rule(
-                    novel_id=novel_id,
-                    name=wd["name"],
-                    description=wd["description"],
-                    **properties,
-                )
-            world_count += 1
-
-        # 保存角色
-        char_count = 0
+            data_type = _TYPE_LOOKUP.get(wd["data_type"]) or _TYPE_LOOKUP[wd["data_type"].upper()]
+            properties = {
+                k: v for k, v in wd.get("properties", {}).items() if v is not None
+            }
+            world_rows.append({
+                "data_type": data_type,
+                "name": wd["name"],
+                "description": wd["description"],
+                "properties": properties,
+            })
+        world_count = self.world_db.bulk_create(novel_id, world_rows)
+
+        # 保存角色：同样批量插入
+        char_rows = []
         for char in character_list:
-            mbti_str = char["mbti"].upper()
-            mbti = MBTIType[mbti_str]
-
-            self.character_db.create_character(
-                novel_id=novel_id,
-                name=char["name"],
-                mbti=mbti,
-                background=char["background"],
-                personality_traits=char.get("personality_traits", {}),
-            )
-            char_count += 1
+            char_rows.append({
+                "name": char["name"],
+                "mbti": _MBTI_LOOKUP.get(char["mbti"]) or _MBTI_LOOKUP[char["mbti"].upper()],
+                "background": char["background"],
+                "personality_traits": char.get("personality_traits", {}),
+            })
+        char_count = self.character_db.bulk_create_characters(novel_id, char_rows)
 
         return {
             "world_data_created": world_count,
@@ -220,19 +211,17 @@ class WorldBuildingGenerator:
             解析失败时返回空结构和 parse_failed=True，不抛异常
         """
         # 尝试提取JSON代码块
-        json_match = re.search(r"```json\s*(\{.*?\})\s*```", content, re.DOTALL)
+        json_match = _JSON_FENCE_RE.search(content)
         if json_match:
             json_str = json_match.group(1)
         else:
-            # 尝试直接查找JSON对象
-            json_match = re.search(r"\{.*\}", content, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
-            else:
+            # 线性括号深度扫描，避免贪婪正则在大输出上的回溯
+            json_str = find_json_object(content)
+            if json_str is None:
                 return {"world_data": [], "characters": []}, True
 
         try:
-            world_building_data = json.loads(json_str)
+            world_building_data = orjson.loads(json_str)
             return world_building_data, False
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             return {"world_data": [], "characters": []}, True
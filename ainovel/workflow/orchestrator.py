@@ -2,22 +2,44 @@
 流程编排器
 
 管理小说创作的完整6步流程,并支持用户编辑每步结果
-"""
-import json
-from typing import Dict, Any, Optional
-from sqlalchemy.orm import Session
 
-from ainovel.workflow.pipeline_runner import PipelineRunner
+并发模型：同步 Session + 线程卸载。Web 层以 asyncio.to_thread 把
+step_* 调用移出事件循环，批量步骤内部用线程池并发、每线程独立会话；
+DB 往返与 LLM 等待在线程中重叠，事件循环不被阻塞
+"""
+import io
+import math
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from dataclasses import dataclass
+from typing import Callable, Dict, Any, List, Optional
+
+import orjson
+from sqlalchemy.orm import Session, selectinload
+
+from ainovel.workflow.pipeline_runner import PipelineRunner, parse_chapter_range
 
 from ainovel.llm.base import BaseLLMClient
-from ainovel.db.novel import WorkflowStatus
-from ainovel.db.crud import novel_crud
+from ainovel.db.novel import Novel, WorkflowStatus
+from ainovel.db.volume import Volume
+from ainovel.db.crud import chapter_crud, style_profile_crud
+from ainovel.cache.llm_cache import (
+    ANALYSIS_PROMPT_VERSION,
+    make_prompt_key,
+    get_cached_response,
+    put_cached_response,
+)
 from ainovel.workflow.generators.planning_generator import PlanningGenerator
 from ainovel.workflow.generators.world_building_generator import WorldBuildingGenerator
 from ainovel.workflow.generators.detail_outline_generator import DetailOutlineGenerator
 from ainovel.workflow.generators.quality_check_generator import QualityCheckGenerator
 from ainovel.workflow.generators.consistency_generator import ConsistencyGenerator
 from ainovel.workflow.generators.title_generator import TitleSynopsisGenerator
+from ainovel.core.prompt_manager import get_prompt_manager
 from ainovel.core.outline_generator import OutlineGenerator
 from ainovel.core.chapter_generator import ChapterGenerator
 from ainovel.core.chapter_rewriter import ChapterRewriter
@@ -33,6 +55,108 @@ from ainovel.exceptions import (
 )
 
 
+# 专项分析支持的维度（KB2 帮回系统）
+ANALYSIS_DIMENSIONS = ("satisfaction", "rhythm", "conflict", "character", "opening")
+
+# 批量生成中单章的耗时上限（秒）。LLM 客户端自身已有界
+# （3 次重试 + 指数退避 + HTTP 超时），此处为防御性兜底：
+# 配置异常导致的无限等待不应拖垮整批并占着会话不放
+_CHAPTER_TIMEOUT_S = float(os.environ.get("AINOVEL_CHAPTER_TIMEOUT", "900"))
+
+# 专项分析送入提示词的正文字符预算：超出模型上下文窗口的部分
+# 无论如何都会被截断，提前在拼接阶段止损，省去超额部分的拼接
+# 与下游分词开销。按约 32k token 窗口扣除提示词脚手架估算
+_ANALYSIS_CONTENT_MAX_CHARS = int(os.environ.get("AINOVEL_ANALYSIS_MAX_CHARS", "100000"))
+
+# 模块级预编译：分析路径每次调用免去 re 缓存查找与导入机制开销
+_JSON_FENCE_RE = re.compile(r"```json\s*([\s\S]+?)\s*```")
+
+# 状态轮询的进程内 TTL 缓存：UI 每秒轮询 get_workflow_status 是常态，
+# TTL 内命中免去 DB 往返；状态变更提交后主动失效，保证写后读一致。
+# 编排器按请求创建，缓存放在模块级才能跨请求命中；严格限进程内，
+# 多进程部署时各 worker 各自缓存，最坏陈旧 TTL 秒
+_STATUS_CACHE_TTL = 2.0
+_STATUS_CACHE_MAXSIZE = 1024
+_status_cache: Dict[int, tuple] = {}  # novel_id -> (过期时刻, 状态字典)
+
+
+def _invalidate_status_cache(novel_id: int) -> None:
+    """状态变更提交后调用，踢除对应小说的缓存条目"""
+    _status_cache.pop(novel_id, None)
+
+
+@dataclass(frozen=True, slots=True)
+class _DetailOutlineItem:
+    """step_4 批量细纲的单章累积结果（槽位化，大批量时省去逐项字典开销）"""
+
+    chapter_id: int
+    chapter_title: str
+    success: bool
+    scenes_count: Optional[int] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """序列化为响应字典，保持成功/失败两种条目的原有键形"""
+        item: Dict[str, Any] = {
+            "chapter_id": self.chapter_id,
+            "chapter_title": self.chapter_title,
+            "success": self.success,
+        }
+        if self.success:
+            item["scenes_count"] = self.scenes_count
+        else:
+            item["error"] = self.error
+        return item
+
+
+class _InFlightCall:
+    """进行中调用的同步句柄：后到者等待 Event 后复用 result 或重抛 error"""
+
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+
+
+_in_flight_lock = threading.Lock()
+_in_flight: Dict[tuple, _InFlightCall] = {}
+
+
+def _dedupe_in_flight(key: tuple, work: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    同键调用的进行中去重
+
+    首个调用者实际执行 work，期间到达的同键调用阻塞等待并复用其
+    结果（或异常），UI 双击/重复提交只花一次 LLM 调用；
+    work 结束后条目即移除，不缓存历史结果
+    """
+    with _in_flight_lock:
+        call = _in_flight.get(key)
+        is_owner = call is None
+        if is_owner:
+            call = _InFlightCall()
+            _in_flight[key] = call
+
+    if not is_owner:
+        call.event.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    try:
+        call.result = work()
+        return call.result
+    except BaseException as e:
+        call.error = e
+        raise
+    finally:
+        with _in_flight_lock:
+            _in_flight.pop(key, None)
+        call.event.set()
+
+
 class WorkflowOrchestrator:
     """流程编排器"""
 
@@ -53,6 +177,7 @@ class WorkflowOrchestrator:
         self.llm_client = llm_client
         self.character_db = character_db
         self.world_db = world_db
+        self.prompt_manager = get_prompt_manager()
 
         # 初始化不需要session的生成器
         self.planning_gen = PlanningGenerator(llm_client)
@@ -63,6 +188,50 @@ class WorkflowOrchestrator:
         self.title_synopsis_gen = TitleSynopsisGenerator(llm_client)
         self.style_analyzer = StyleAnalyzer(llm_client)
 
+        # 需要 session 的生成器按会话惰性构造并复用：流水线在同一
+        # 会话内逐章调用 step_5 时不再每章重建（含其内部的角色库/
+        # 世界观库/上下文压缩器）。键为 id(session)，编排器按请求
+        # 创建，生命周期不长于会话，不存在 id 复用误配
+        self._session_generators: Dict[tuple, Any] = {}
+
+        # 角色名 → 档案文本映射，按 (id(session), novel_id) 记忆化：
+        # 批量逐角色分析时只读取一次角色库，后续查找 O(1)
+        self._character_profile_maps: Dict[tuple, Dict[str, str]] = {}
+
+        # 流水线执行器惰性构造并复用：runner 只持有编排器引用，
+        # 会话/计划均逐次传参，无跨次调用状态，可安全跨调用复用
+        self._pipeline_runner: Optional[PipelineRunner] = None
+
+    def _get_outline_generator(self, session: Session) -> OutlineGenerator:
+        """按会话复用 OutlineGenerator"""
+        key = ("outline", id(session))
+        gen = self._session_generators.get(key)
+        if gen is None:
+            gen = OutlineGenerator(self.llm_client, session)
+            self._session_generators[key] = gen
+        return gen
+
+    def _get_chapter_generator(self, session: Session) -> ChapterGenerator:
+        """按会话复用 ChapterGenerator"""
+        key = ("chapter", id(session))
+        gen = self._session_generators.get(key)
+        if gen is None:
+            gen = ChapterGenerator(self.llm_client, session)
+            self._session_generators[key] = gen
+        return gen
+
+    def _get_novel(self, session: Session, novel_id: int) -> Optional[Novel]:
+        """
+        查询小说（走 Session 身份映射缓存）
+
+        session.get 命中身份映射时不发 SQL；同一请求/流水线内
+        多个步骤先后查同一部小说只有首次真正落库，
+        会话提交或关闭后自然失效，无需手动清理。
+        无需在 session.info 上另建显式缓存：身份映射本身就是
+        会话级缓存，且 session.get 的主键查找不经查询编译。
+        """
+        return session.get(Novel, novel_id)
+
     def get_workflow_status(self, session: Session, novel_id: int) -> Dict[str, Any]:
         """
         获取小说的工作流状态
@@ -80,16 +249,24 @@ class WorkflowOrchestrator:
                 "can_continue": true
             }
         """
-        novel = novel_crud.get_by_id(session, novel_id)
+        cached = _status_cache.get(novel_id)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        novel = self._get_novel(session, novel_id)
         if not novel:
             raise NovelNotFoundError(novel_id)
 
-        return {
+        status = {
             "novel_id": novel.id,
             "workflow_status": novel.workflow_status.value,
             "current_step": novel.current_step,
-            "can_continue": self._can_continue_to_next_step(novel),
+            "can_continue": self._can_continue_to_next_step(session, novel),
         }
+        if len(_status_cache) >= _STATUS_CACHE_MAXSIZE:
+            _status_cache.clear()
+        _status_cache[novel_id] = (time.monotonic() + _STATUS_CACHE_TTL, status)
+        return status
 
     def step_1_planning(
         self,
@@ -108,7 +285,19 @@ class WorkflowOrchestrator:
         Returns:
             生成结果
         """
-        novel = novel_crud.get_by_id(session, novel_id)
+        return _dedupe_in_flight(
+            ("step_1_planning", novel_id),
+            lambda: self._step_1_planning_impl(session, novel_id, initial_idea),
+        )
+
+    def _step_1_planning_impl(
+        self,
+        session: Session,
+        novel_id: int,
+        initial_idea: Optional[str],
+    ) -> Dict[str, Any]:
+        """step_1_planning 的实际执行体（经进行中去重后调用）"""
+        novel = self._get_novel(session, novel_id)
         if not novel:
             raise NovelNotFoundError(novel_id)
 
@@ -133,6 +322,7 @@ class WorkflowOrchestrator:
         novel.workflow_status = WorkflowStatus.PLANNING
         novel.current_step = 1
         session.commit()
+        _invalidate_status_cache(novel.id)
 
         result["novel_id"] = novel_id
         result["workflow_status"] = novel.workflow_status.value
@@ -156,7 +346,7 @@ class WorkflowOrchestrator:
         Returns:
             更新结果
         """
-        novel = novel_crud.get_by_id(session, novel_id)
+        novel = self._get_novel(session, novel_id)
         if not novel:
             raise NovelNotFoundError(novel_id)
 
@@ -164,6 +354,7 @@ class WorkflowOrchestrator:
         novel.workflow_status = WorkflowStatus.PLANNING
         novel.current_step = 1
         session.commit()
+        _invalidate_status_cache(novel.id)
 
         return {
             "novel_id": novel_id,
@@ -185,7 +376,7 @@ class WorkflowOrchestrator:
         Returns:
             更新结果
         """
-        novel = novel_crud.get_by_id(session, novel_id)
+        novel = self._get_novel(session, novel_id)
         if not novel:
             raise NovelNotFoundError(novel_id)
 
@@ -194,6 +385,7 @@ class WorkflowOrchestrator:
         novel.workflow_status = WorkflowStatus.WORLD_BUILDING
         novel.current_step = 2
         session.commit()
+        _invalidate_status_cache(novel.id)
 
         return {
             "novel_id": novel_id,
@@ -214,7 +406,16 @@ class WorkflowOrchestrator:
         Returns:
             生成结果
         """
-        novel = novel_crud.get_by_id(session, novel_id)
+        return _dedupe_in_flight(
+            ("step_2_world_building", novel_id),
+            lambda: self._step_2_world_building_impl(session, novel_id),
+        )
+
+    def _step_2_world_building_impl(
+        self, session: Session, novel_id: int
+    ) -> Dict[str, Any]:
+        """step_2_world_building 的实际执行体（经进行中去重后调用）"""
+        novel = self._get_novel(session, novel_id)
         if not novel:
             raise NovelNotFoundError(novel_id)
 
@@ -239,6 +440,7 @@ class WorkflowOrchestrator:
         novel.workflow_status = WorkflowStatus.WORLD_BUILDING
         novel.current_step = 2
         session.commit()
+        _invalidate_status_cache(novel.id)
 
         # 将嵌套的 world_building 字段展开到顶层，以匹配 Step2Response 结构
         world_building = result.pop("world_building", {})
@@ -260,12 +462,19 @@ class WorkflowOrchestrator:
         Returns:
             生成结果
         """
-        novel = novel_crud.get_by_id(session, novel_id)
+        return _dedupe_in_flight(
+            ("step_3_outline", novel_id),
+            lambda: self._step_3_outline_impl(session, novel_id),
+        )
+
+    def _step_3_outline_impl(self, session: Session, novel_id: int) -> Dict[str, Any]:
+        """step_3_outline 的实际执行体（经进行中去重后调用）"""
+        novel = self._get_novel(session, novel_id)
         if not novel:
             raise NovelNotFoundError(novel_id)
 
-        # 创建OutlineGenerator实例（需要session）
-        outline_gen = OutlineGenerator(self.llm_client, session)
+        # 获取OutlineGenerator实例（需要session，按会话复用）
+        outline_gen = self._get_outline_generator(session)
 
         # 生成并保存大纲
         result = outline_gen.generate_and_save(novel_id=novel_id)
@@ -274,6 +483,7 @@ class WorkflowOrchestrator:
         novel.workflow_status = WorkflowStatus.OUTLINE
         novel.current_step = 3
         session.commit()
+        _invalidate_status_cache(novel.id)
 
         result["novel_id"] = novel_id
         result["workflow_status"] = novel.workflow_status.value
@@ -294,9 +504,8 @@ class WorkflowOrchestrator:
         Returns:
             生成结果
         """
-        from ainovel.db.crud import chapter_crud
-
-        chapter = chapter_crud.get_by_id(session, chapter_id)
+        # 单条 JOIN 预加载分卷与小说，免去两次惰性补充查询
+        chapter = chapter_crud.get_by_id_with_parents(session, chapter_id)
         if not chapter:
             raise ValueError(f"章节不存在: {chapter_id}")
 
@@ -312,70 +521,150 @@ class WorkflowOrchestrator:
             novel.workflow_status = WorkflowStatus.DETAIL_OUTLINE
             novel.current_step = 4
             session.commit()
+            _invalidate_status_cache(novel.id)
 
         result["novel_id"] = novel.id
         result["workflow_status"] = novel.workflow_status.value
         return result
 
     def step_4_batch_detail_outline(
-        self, session: Session, novel_id: int
+        self, session: Session, novel_id: int, max_workers: int = 1
     ) -> Dict[str, Any]:
         """
         步骤4：为所有章节批量生成详细细纲
 
+        LLM 调用为网络 I/O 密集型，max_workers > 1 时用线程池并发各章节，
+        墙钟耗时由 O(N·RTT) 降为受并发度约束的 O(RTT)；
+        每个线程持有独立 Session（Session 不可跨线程共享），
+        Web 层并发度由 AINOVEL_BATCH_CONCURRENCY 环境变量控制；
+        默认 1 保持串行路径（共享会话 + 批末尾单次 commit），
+        由调用方显式选择并发度。
+
         Args:
             session: 数据库会话
             novel_id: 小说ID
+            max_workers: 并发线程数，1 表示串行
 
         Returns:
             生成结果
         """
-        novel = novel_crud.get_by_id(session, novel_id)
+        from ainovel.db.database import get_database
+
+        # 一次性预加载全部卷/章（2 条查询），消除逐卷的 lazy-load N+1
+        novel = (
+            session.query(Novel)
+            .options(selectinload(Novel.volumes).selectinload(Volume.chapters))
+            .filter(Novel.id == novel_id)
+            .first()
+        )
         if not novel:
             raise NovelNotFoundError(novel_id)
 
-        # 获取所有章节
-        all_chapters = []
-        for volume in novel.volumes:
-            all_chapters.extend(volume.chapters)
+        # 获取所有章节（排序规则统一走模型属性）
+        all_chapters = novel.ordered_chapters
 
         if not all_chapters:
             raise ValueError("没有章节可生成细纲")
 
-        results = []
-        for chapter in all_chapters:
+        def _generate_one(
+            chapter_id: int, chapter_title: str, work_session: Session, commit: bool = True
+        ) -> _DetailOutlineItem:
             try:
                 result = self.detail_outline_gen.generate_and_save(
-                    session=session, chapter_id=chapter.id
+                    session=work_session, chapter_id=chapter_id, commit=commit
                 )
-                results.append(
-                    {
-                        "chapter_id": chapter.id,
-                        "chapter_title": chapter.title,
-                        "success": True,
-                        "scenes_count": result["stats"]["scenes_count"],
-                    }
+                return _DetailOutlineItem(
+                    chapter_id=chapter_id,
+                    chapter_title=chapter_title,
+                    success=True,
+                    scenes_count=result["stats"]["scenes_count"],
                 )
             except Exception as e:
-                results.append(
-                    {
-                        "chapter_id": chapter.id,
-                        "chapter_title": chapter.title,
-                        "success": False,
-                        "error": str(e),
-                    }
+                return _DetailOutlineItem(
+                    chapter_id=chapter_id,
+                    chapter_title=chapter_title,
+                    success=False,
+                    error=str(e),
                 )
 
-        # 更新状态
+        chapter_infos = [(chapter.id, chapter.title) for chapter in all_chapters]
+
+        if max_workers <= 1:
+            # 共享会话串行执行：逐章不提交（细纲与缓存写入均只 flush），
+            # 批末尾随状态更新一次 commit，把 N+1 次 fsync 合并为 1 次；
+            # _generate_one 逐章捕获异常，失败章节只记错，
+            # 不污染已累积的待提交写入
+            results = [
+                _generate_one(cid, ctitle, session, commit=False)
+                for cid, ctitle in chapter_infos
+            ]
+        else:
+
+            def _worker(chapter_id: int, chapter_title: str) -> _DetailOutlineItem:
+                db = get_database()
+                work_session = db.get_session()
+                try:
+                    return _generate_one(chapter_id, chapter_title, work_session)
+                finally:
+                    work_session.close()
+
+            # 线程池即有界窗口调度：任一时刻至多 max_workers 个请求在途，
+            # 完成一个即补位一个，不会对 LLM 提供商全量扇出
+            title_by_id = dict(chapter_infos)
+            result_map: Dict[int, _DetailOutlineItem] = {}
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            try:
+                future_map = {
+                    executor.submit(_worker, cid, ctitle): cid
+                    for cid, ctitle in chapter_infos
+                }
+                # 整批预算 = 单章上限 × 在途波次数；超过即放弃未完成章节
+                budget = _CHAPTER_TIMEOUT_S * math.ceil(len(future_map) / max_workers)
+                try:
+                    for future in as_completed(future_map, timeout=budget):
+                        cid = future_map[future]
+                        try:
+                            item = future.result()
+                        except Exception as e:
+                            # 工作线程在 _generate_one 之外失败（如会话获取），
+                            # 记为该章节的错误，不中断其余在途章节
+                            item = _DetailOutlineItem(
+                                chapter_id=cid,
+                                chapter_title=title_by_id[cid],
+                                success=False,
+                                error=str(e),
+                            )
+                        result_map[cid] = item
+                except FuturesTimeoutError:
+                    # 超时章节记为失败后立即返回；在途线程无法强杀，
+                    # 留在后台自行收尾（各持独立会话，结果不再采信）
+                    for future, cid in future_map.items():
+                        if cid not in result_map:
+                            future.cancel()
+                            result_map[cid] = _DetailOutlineItem(
+                                chapter_id=cid,
+                                chapter_title=title_by_id[cid],
+                                success=False,
+                                error="timeout",
+                            )
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+            # 按章节原始顺序组装结果
+            results = [result_map[cid] for cid, _ in chapter_infos]
+
+        # 更新状态：novel 行仅在批末尾写一次（单条 UPDATE），
+        # 逐章的 generate_and_save 不触碰该行，避免批量期间的行锁争用
         novel.workflow_status = WorkflowStatus.DETAIL_OUTLINE
         novel.current_step = 4
         session.commit()
+        _invalidate_status_cache(novel.id)
 
         return {
             "novel_id": novel_id,
             "workflow_status": novel.workflow_status.value,
             "total_chapters": len(all_chapters),
-            "results": results,
+            # 仅在响应组装时序列化为字典，累积阶段保持槽位化条目
+            "results": [item.to_dict() for item in results],
         }
 
     def step_5_writing(
@@ -385,6 +674,7 @@ class WorkflowOrchestrator:
         style_guide: Optional[str] = None,
         style_profile_id: Optional[int] = None,
         authors_note: Optional[str] = None,
+        on_delta: Optional[Callable[[str], None]] = None,
     ) -> Dict[str, Any]:
         """
         步骤5：为指定章节生成内容
@@ -395,13 +685,13 @@ class WorkflowOrchestrator:
             style_guide: 写作风格指南（直接传入文本，优先级最高）
             style_profile_id: 指定文风档案ID（次优先）；若两者均为None则自动加载激活档案
             authors_note: 作者备注，动态注入的写作指令（参考KoboldAI Author's Note）
+            on_delta: 流式增量回调；Web 层据此边生成边下发章节文本
 
         Returns:
             生成结果
         """
-        from ainovel.db.crud import chapter_crud
-
-        chapter = chapter_crud.get_by_id(session, chapter_id)
+        # 单条 JOIN 预加载分卷与小说，免去两次惰性补充查询
+        chapter = chapter_crud.get_by_id_with_parents(session, chapter_id)
         if not chapter:
             raise ValueError(f"章节不存在: {chapter_id}")
 
@@ -414,14 +704,15 @@ class WorkflowOrchestrator:
             else:
                 style_guide = StyleApplicator.load_active_guide(session, novel.id)
 
-        # 创建ChapterGenerator实例（需要session）
-        chapter_gen = ChapterGenerator(self.llm_client, session)
+        # 获取ChapterGenerator实例（需要session，按会话复用）
+        chapter_gen = self._get_chapter_generator(session)
 
         # 生成并保存章节内容
         result = chapter_gen.generate_and_save(
             chapter_id=chapter_id,
             style_guide=style_guide,
             authors_note=authors_note or "",
+            on_delta=on_delta,
         )
 
         # 更新小说状态（第一次生成内容时）
@@ -429,6 +720,7 @@ class WorkflowOrchestrator:
             novel.workflow_status = WorkflowStatus.WRITING
             novel.current_step = 5
             session.commit()
+            _invalidate_status_cache(novel.id)
 
         result["novel_id"] = novel.id
         result["workflow_status"] = novel.workflow_status.value
@@ -449,9 +741,8 @@ class WorkflowOrchestrator:
         Returns:
             检查结果
         """
-        from ainovel.db.crud import chapter_crud
-
-        chapter = chapter_crud.get_by_id(session, chapter_id)
+        # 单条 JOIN 预加载分卷与小说，免去两次惰性补充查询
+        chapter = chapter_crud.get_by_id_with_parents(session, chapter_id)
         if not chapter:
             raise ValueError(f"章节不存在: {chapter_id}")
 
@@ -466,6 +757,7 @@ class WorkflowOrchestrator:
             novel.workflow_status = WorkflowStatus.QUALITY_CHECK
             novel.current_step = 6
             session.commit()
+            _invalidate_status_cache(novel.id)
 
         result["novel_id"] = novel.id
         result["workflow_status"] = novel.workflow_status.value
@@ -474,7 +766,7 @@ class WorkflowOrchestrator:
         return result
 
     def step_6_batch_quality_check(
-        self, session: Session, novel_id: int
+        self, session: Session, novel_id: int, max_workers: int = 1
     ) -> Dict[str, Any]:
         """
         步骤6：批量检查小说所有已生成章节
@@ -482,20 +774,24 @@ class WorkflowOrchestrator:
         Args:
             session: 数据库会话
             novel_id: 小说ID
+            max_workers: 并发线程数，1 表示串行
 
         Returns:
             批量检查结果
         """
-        novel = novel_crud.get_by_id(session, novel_id)
+        novel = self._get_novel(session, novel_id)
         if not novel:
             raise NovelNotFoundError(novel_id)
 
-        result = self.quality_check_gen.batch_check(session=session, novel_id=novel_id)
+        result = self.quality_check_gen.batch_check(
+            session=session, novel_id=novel_id, max_workers=max_workers
+        )
 
         # 更新状态
         novel.workflow_status = WorkflowStatus.QUALITY_CHECK
         novel.current_step = 6
         session.commit()
+        _invalidate_status_cache(novel.id)
 
         result["workflow_status"] = novel.workflow_status.value
         return result
@@ -519,8 +815,6 @@ class WorkflowOrchestrator:
         Returns:
             一致性检查结果
         """
-        from ainovel.db.crud import chapter_crud
-
         chapter = chapter_crud.get_by_id(session, chapter_id)
         if not chapter:
             raise ValueError(f"章节不存在: {chapter_id}")
@@ -561,8 +855,6 @@ class WorkflowOrchestrator:
             rewrite_mode: rewrite | polish | expand
             save: 是否落库
         """
-        from ainovel.db.crud import chapter_crud
-
         chapter = chapter_crud.get_by_id(session, chapter_id)
         if not chapter:
             raise ValueError(f"章节不存在: {chapter_id}")
@@ -589,8 +881,6 @@ class WorkflowOrchestrator:
         save: bool = True,
     ) -> Dict[str, Any]:
         """回滚章节到历史改写版本。"""
-        from ainovel.db.crud import chapter_crud
-
         chapter = chapter_crud.get_by_id(session, chapter_id)
         if not chapter:
             raise ValueError(f"章节不存在: {chapter_id}")
@@ -631,7 +921,7 @@ class WorkflowOrchestrator:
                 "novel_id": 1,
             }
         """
-        novel = novel_crud.get_by_id(session, novel_id)
+        novel = self._get_novel(session, novel_id)
         if not novel:
             raise NovelNotFoundError(novel_id)
 
@@ -656,9 +946,7 @@ class WorkflowOrchestrator:
         Returns:
             档案列表
         """
-        from ainovel.db.crud import style_profile_crud
-
-        novel = novel_crud.get_by_id(session, novel_id)
+        novel = self._get_novel(session, novel_id)
         if not novel:
             raise NovelNotFoundError(novel_id)
 
@@ -682,8 +970,6 @@ class WorkflowOrchestrator:
         Returns:
             激活结果
         """
-        from ainovel.db.crud import style_profile_crud
-
         profile = style_profile_crud.set_active(session, novel_id, profile_id)
         if not profile:
             raise ValueError(f"文风档案不存在或不属于该小说: profile_id={profile_id}")
@@ -701,12 +987,13 @@ class WorkflowOrchestrator:
         Returns:
             结果信息
         """
-        novel = novel_crud.get_by_id(session, novel_id)
+        novel = self._get_novel(session, novel_id)
         if not novel:
             raise NovelNotFoundError(novel_id)
 
         novel.workflow_status = WorkflowStatus.COMPLETED
         session.commit()
+        _invalidate_status_cache(novel.id)
 
         return {
             "novel_id": novel_id,
@@ -739,7 +1026,8 @@ class WorkflowOrchestrator:
         Returns:
             PipelineResult.to_dict()
         """
-        runner = PipelineRunner(self)
+        if self._pipeline_runner is None:
+            self._pipeline_runner = PipelineRunner(self)
         plan = {
             "from_step": from_step,
             "to_step": to_step,
@@ -747,9 +1035,9 @@ class WorkflowOrchestrator:
             "regenerate": regenerate,
             "max_workers": max_workers,
         }
-        return runner.run(session, novel_id, plan)
+        return self._pipeline_runner.run(session, novel_id, plan)
 
-    def _can_continue_to_next_step(self, novel) -> bool:
+    def _can_continue_to_next_step(self, session: Session, novel) -> bool:
         """检查是否可以继续到下一步"""
         current_step = novel.current_step
 
@@ -757,11 +1045,15 @@ class WorkflowOrchestrator:
             return True  # 可以开始步骤1
         elif current_step == 1:
             return novel.planning_content is not None
-        elif current_step == 2:
-            # 检查是否有角色和世界观数据
-            return len(novel.volumes) == 0  # 还没生成大纲，可以继续
-        elif current_step == 3:
-            return len(novel.volumes) > 0  # 已有大纲，可以继续
+        elif current_step in (2, 3):
+            # EXISTS 探针代替 len(novel.volumes)：
+            # 状态轮询高频调用，判断布尔无需物化整个卷集合
+
+            has_volumes = session.query(
+                session.query(Volume).filter_by(novel_id=novel.id).exists()
+            ).scalar()
+            # step2：还没生成大纲才可继续；step3：已有大纲才可继续
+            return not has_volumes if current_step == 2 else bool(has_volumes)
         elif current_step == 4:
             return True  # 可以继续写作
         elif current_step == 5:
@@ -791,7 +1083,7 @@ class WorkflowOrchestrator:
                 "cost": float
             }
         """
-        novel = novel_crud.get_by_id(session, novel_id)
+        novel = self._get_novel(session, novel_id)
         if not novel:
             raise NovelNotFoundError(novel_id)
 
@@ -803,12 +1095,9 @@ class WorkflowOrchestrator:
                 missing_data="planning_content 或 description",
             )
 
-        # 提取主角信息（从世界构建内容或描述中获取）
-        protagonist = ""
-        characters = self.character_db.get_characters(session, novel_id)
-        if characters:
-            main_char = characters[0]
-            protagonist = f"{main_char.get('name', '')}：{main_char.get('description', '')}"
+        # 提取主角信息（建档最早的角色即主角，数据库层 LIMIT 1 取单行）
+        main_char = self.character_db.get_main_character(novel_id)
+        protagonist = f"{main_char.name}：{main_char.background or ''}" if main_char else ""
 
         # 提取核心爽点（从规划内容中截取前200字作为摘要）
         key_appeal = story_core[:200] if len(story_core) > 200 else story_core
@@ -830,22 +1119,28 @@ class WorkflowOrchestrator:
         session: Session,
         novel_id: int,
         chapter_range: str | None = None,
+        max_chars: int | None = None,
     ) -> tuple:
         """
         收集章节内容，返回 (chapters, range_str, content_str, total_words)
 
         Args:
-            chapter_range: 如 "1-10"，None 表示全部
+            chapter_range: 如 "1-10" 或 "1,3,5"，None 表示全部
+            max_chars: 正文拼接的字符预算，达到后停止拼接后续章节
+                （total_words 仍统计全部选中章节）；None 表示不限
         """
-        novel = novel_crud.get_by_id(session, novel_id)
+        # 一次性预加载全部卷/章（2 条查询），消除逐卷逐章的 lazy-load N+1
+        novel = (
+            session.query(Novel)
+            .options(selectinload(Novel.volumes).selectinload(Volume.chapters))
+            .filter(Novel.id == novel_id)
+            .first()
+        )
         if not novel:
             raise NovelNotFoundError(novel_id)
 
-        all_chapters = []
-        for volume in sorted(novel.volumes, key=lambda v: v.order):
-            all_chapters.extend(sorted(volume.chapters, key=lambda c: c.order))
-
-        chapters_with_content = [c for c in all_chapters if c.content]
+        # 排序在已取回的内存列表上进行，不再触发补充查询
+        chapters_with_content = [c for c in novel.ordered_chapters if c.content]
         if not chapters_with_content:
             raise InsufficientDataError(
                 "没有已生成正文的章节，请先完成步骤5（章节写作）",
@@ -853,56 +1148,113 @@ class WorkflowOrchestrator:
             )
 
         if chapter_range:
-            parts = chapter_range.split("-")
-            start = int(parts[0]) - 1
-            end = int(parts[1]) if len(parts) > 1 else len(chapters_with_content)
-            selected = chapters_with_content[start:end]
+            # 复用流水线的范围解析，统一支持 "1-10" / "1,3,5" / "5"
+            # （此前只识别连字符形式，逗号形式会在 int() 处直接炸掉）
+            indices = parse_chapter_range(chapter_range, len(chapters_with_content))
+            selected = [chapters_with_content[i - 1] for i in indices]
             range_str = chapter_range
         else:
             selected = chapters_with_content
             range_str = f"1-{len(selected)}"
 
-        content_parts = [
-            f"【第{i}章：{ch.title}】\n{ch.content}"
-            for i, ch in enumerate(selected, 1)
-        ]
-        content_str = "\n\n".join(content_parts)
-        total_words = sum(ch.word_count or len(ch.content or "") for ch in selected)
+        # 单遍扫描：StringIO 增量写入替代「整本列表 + join」的双倍峰值内存，
+        # 字数统计合并进同一遍循环
+        buf = io.StringIO()
+        total_words = 0
+        for i, ch in enumerate(selected, 1):
+            total_words += ch.word_count or len(ch.content or "")
+            # 预算用尽即止损：后续章节横竖进不了上下文窗口，
+            # 不再为其支付拼接与下游分词的开销
+            if max_chars is not None and buf.tell() >= max_chars:
+                continue
+            if buf.tell() > 0:
+                buf.write("\n\n")
+            buf.write(f"【第{i}章：{ch.title}】\n")
+            buf.write(ch.content)
+        content_str = buf.getvalue()
 
         return selected, range_str, content_str, total_words
 
     def _call_analysis(
         self,
-        prompt: str,
+        prompt,
         temperature: float = 0.3,
         max_tokens: int = 3000,
+        session: Optional[Session] = None,
     ) -> Dict[str, Any]:
-        """调用 LLM 执行分析，返回解析后的 JSON 或原始文本"""
-        import json
-        import re
+        """
+        调用 LLM 执行分析，返回解析后的 JSON 或原始文本
+
+        prompt 可为完整字符串，或 (静态评分标准, 动态输入) 二元组：
+        二元组时对静态前缀启用提供商提示词缓存（cache_control），
+        同一评分标准的重复分析只为动态部分付全价输入 token。
+
+        传入 session 时启用提示词哈希缓存：章节范围未变更的重复分析
+        直接复用上次结果（毫秒级返回、零计费）。并行批量路径不传
+        session（会话不可跨线程共享），各维度照常调用
+        """
+        if isinstance(prompt, tuple):
+            static_part, dynamic_part = prompt
+            full_prompt = static_part + dynamic_part
+        else:
+            static_part, dynamic_part = None, None
+            full_prompt = prompt
+
+        cache_key = None
+        if session is not None:
+            cache_key = make_prompt_key(
+                f"{temperature}|{max_tokens}|{full_prompt}",
+                getattr(self.llm_client, "model", "") or "",
+                ANALYSIS_PROMPT_VERSION,
+            )
+            cached = get_cached_response(session, cache_key)
+            if cached is not None:
+                return {
+                    **cached,
+                    "usage": {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0},
+                    "cost": 0,
+                    "cached": True,
+                }
+
+        # 支持显式缓存断点的客户端发送分块内容；其他客户端发送
+        # 拼接串，字节恒定的前缀仍可命中提供商的自动 prefix cache
+        if static_part is not None and self.llm_client.supports_prompt_caching():
+            content: Any = [
+                {"type": "text", "text": static_part, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": dynamic_part},
+            ]
+        else:
+            content = full_prompt
 
         response = self.llm_client.generate(
-            messages=[{"role": "user", "content": prompt}],
+            messages=[{"role": "user", "content": content}],
             temperature=temperature,
             max_tokens=max_tokens,
         )
         raw = response.get("content") or ""
 
-        match = re.search(r"```json\s*([\s\S]+?)\s*```", raw)
+        data: Optional[Dict[str, Any]] = None
+        match = _JSON_FENCE_RE.search(raw)
         if match:
             try:
-                data = json.loads(match.group(1))
-            except json.JSONDecodeError:
-                data = {"raw": raw}
+                data = orjson.loads(match.group(1))
+            except orjson.JSONDecodeError:
+                data = None
         else:
             start, end = raw.find("{"), raw.rfind("}") + 1
             if start != -1 and end > start:
                 try:
-                    data = json.loads(raw[start:end])
-                except json.JSONDecodeError:
-                    data = {"raw": raw}
-            else:
-                data = {"raw": raw}
+                    data = orjson.loads(raw[start:end])
+                except orjson.JSONDecodeError:
+                    data = None
+
+        if data is None:
+            # 解析失败结果不入缓存，下次重试
+            data = {"raw": raw}
+        elif cache_key is not None:
+            put_cached_response(
+                session, cache_key, data, prompt_version=ANALYSIS_PROMPT_VERSION
+            )
 
         return {**data, "usage": response.get("usage", {}), "cost": response.get("cost", 0)}
 
@@ -914,14 +1266,14 @@ class WorkflowOrchestrator:
     ) -> Dict[str, Any]:
         """爽点专项分析（KB2 帮回系统）"""
         _, range_str, content_str, total_words = self._collect_chapters_content(
-            session, novel_id, chapter_range
+            session, novel_id, chapter_range, max_chars=_ANALYSIS_CONTENT_MAX_CHARS
         )
-        prompt = self.prompt_manager.generate_satisfaction_analysis_prompt(
+        prompt = self.prompt_manager.generate_satisfaction_analysis_prompt_parts(
             chapter_range=range_str,
             total_words=total_words,
             chapters_content=content_str,
         )
-        result = self._call_analysis(prompt)
+        result = self._call_analysis(prompt, session=session)
         result["novel_id"] = novel_id
         return result
 
@@ -933,14 +1285,14 @@ class WorkflowOrchestrator:
     ) -> Dict[str, Any]:
         """节奏专项分析（KB2 帮回系统）"""
         _, range_str, content_str, total_words = self._collect_chapters_content(
-            session, novel_id, chapter_range
+            session, novel_id, chapter_range, max_chars=_ANALYSIS_CONTENT_MAX_CHARS
         )
-        prompt = self.prompt_manager.generate_rhythm_analysis_prompt(
+        prompt = self.prompt_manager.generate_rhythm_analysis_prompt_parts(
             chapter_range=range_str,
             total_words=total_words,
             chapters_content=content_str,
         )
-        result = self._call_analysis(prompt)
+        result = self._call_analysis(prompt, session=session)
         result["novel_id"] = novel_id
         return result
 
@@ -952,14 +1304,14 @@ class WorkflowOrchestrator:
     ) -> Dict[str, Any]:
         """冲突专项分析（KB2 帮回系统）"""
         _, range_str, content_str, total_words = self._collect_chapters_content(
-            session, novel_id, chapter_range
+            session, novel_id, chapter_range, max_chars=_ANALYSIS_CONTENT_MAX_CHARS
         )
-        prompt = self.prompt_manager.generate_conflict_analysis_prompt(
+        prompt = self.prompt_manager.generate_conflict_analysis_prompt_parts(
             chapter_range=range_str,
             total_words=total_words,
             chapters_content=content_str,
         )
-        result = self._call_analysis(prompt)
+        result = self._call_analysis(prompt, session=session)
         result["novel_id"] = novel_id
         return result
 
@@ -972,23 +1324,14 @@ class WorkflowOrchestrator:
     ) -> Dict[str, Any]:
         """人设专项检查（KB2 帮回系统）"""
         _, range_str, content_str, _ = self._collect_chapters_content(
-            session, novel_id, chapter_range
+            session, novel_id, chapter_range, max_chars=_ANALYSIS_CONTENT_MAX_CHARS
         )
-        characters = self.character_db.get_characters(session, novel_id)
-        character_profile = ""
-        for char in characters:
-            if char.get("name", "") == character_name:
-                character_profile = str(char)
-                break
-        if not character_profile:
-            character_profile = f"角色名：{character_name}（未找到详细档案）"
-
-        prompt = self.prompt_manager.generate_character_check_prompt(
+        prompt = self.prompt_manager.generate_character_check_prompt_parts(
             character_name=character_name,
-            character_profile=character_profile,
+            character_profile=self._get_character_profile(session, novel_id, character_name),
             chapters_content=content_str,
         )
-        result = self._call_analysis(prompt)
+        result = self._call_analysis(prompt, session=session)
         result["novel_id"] = novel_id
         result["character_name"] = character_name
         return result
@@ -999,15 +1342,41 @@ class WorkflowOrchestrator:
         novel_id: int,
     ) -> Dict[str, Any]:
         """开篇质量专项检查（KB2 黄金开篇五大铁律）"""
-        novel = novel_crud.get_by_id(session, novel_id)
+        prompt = self._build_opening_prompt(session, novel_id)
+        result = self._call_analysis(prompt, session=session)
+        result["novel_id"] = novel_id
+        return result
+
+    def _get_character_profile(
+        self, session: Session, novel_id: int, character_name: str
+    ) -> str:
+        """查找角色档案文本，未找到时返回占位描述（映射按会话+小说记忆化）"""
+        key = (id(session), novel_id)
+        profile_map = self._character_profile_maps.get(key)
+        if profile_map is None:
+            characters = self.character_db.list_characters(novel_id)
+            profile_map = {
+                char.name: (
+                    f"角色名：{char.name}\n"
+                    f"MBTI：{char.mbti.value}\n"
+                    f"背景：{char.background}\n"
+                    f"性格特征：{char.personality_traits or {}}\n"
+                    f"当前目标：{char.goals or '未记录'}"
+                )
+                for char in characters
+            }
+            self._character_profile_maps[key] = profile_map
+        return profile_map.get(
+            character_name, f"角色名：{character_name}（未找到详细档案）"
+        )
+
+    def _build_opening_prompt(self, session: Session, novel_id: int) -> tuple:
+        """构建开篇质量检查提示词的 (静态评分标准, 动态输入) 二元组（前3章正文）"""
+        novel = self._get_novel(session, novel_id)
         if not novel:
             raise NovelNotFoundError(novel_id)
 
-        all_chapters = []
-        for volume in sorted(novel.volumes, key=lambda v: v.order):
-            all_chapters.extend(sorted(volume.chapters, key=lambda c: c.order))
-
-        opening = [c for c in all_chapters if c.content][:3]
+        opening = [c for c in novel.ordered_chapters if c.content][:3]
         if not opening:
             raise InsufficientDataError(
                 "没有已生成正文的章节，请先完成步骤5（章节写作）",
@@ -1018,9 +1387,102 @@ class WorkflowOrchestrator:
             f"【第{i}章：{ch.title}】\n{ch.content}"
             for i, ch in enumerate(opening, 1)
         ]
-        prompt = self.prompt_manager.generate_opening_check_prompt(
+        return self.prompt_manager.generate_opening_check_prompt_parts(
             opening_chapters="\n\n".join(content_parts),
         )
-        result = self._call_analysis(prompt)
-        result["novel_id"] = novel_id
-        return result
+
+    def analyze_multi(
+        self,
+        session: Session,
+        novel_id: int,
+        dimensions: List[str],
+        chapter_range: str | None = None,
+        character_name: str | None = None,
+    ) -> Dict[str, Any]:
+        """
+        多维度批量分析（KB2 帮回系统）
+
+        共享一次章节内容收集与提示词构建，各维度 LLM 调用并行执行，
+        避免"全维度分析"时对相同章节的重复读取。
+
+        Args:
+            session: 数据库会话
+            novel_id: 小说ID
+            dimensions: 分析维度列表（satisfaction/rhythm/conflict/character/opening）
+            chapter_range: 章节范围，如 "1-10"，None 表示全部
+            character_name: character 维度所需的角色名
+
+        Returns:
+            {"novel_id": ..., "dimensions": [...], "results": {维度: 分析结果}}
+        """
+        dims = list(dict.fromkeys(dimensions))
+        invalid = [d for d in dims if d not in ANALYSIS_DIMENSIONS]
+        if invalid:
+            raise ValueError(f"不支持的分析维度: {invalid}，可选: {list(ANALYSIS_DIMENSIONS)}")
+        if not dims:
+            raise ValueError("至少需要一个分析维度")
+        if "character" in dims and not character_name:
+            raise ValueError("character 维度需要提供 character_name")
+
+        # 一次性收集章节内容，供除 opening 外的所有维度共享；
+        # 各维度提示词均为 (静态评分标准, 动态输入) 二元组
+        prompts: Dict[str, tuple] = {}
+        content_dims = [d for d in dims if d != "opening"]
+        if content_dims:
+            _, range_str, content_str, total_words = self._collect_chapters_content(
+                session, novel_id, chapter_range, max_chars=_ANALYSIS_CONTENT_MAX_CHARS
+            )
+            for dim in content_dims:
+                if dim == "satisfaction":
+                    prompts[dim] = self.prompt_manager.generate_satisfaction_analysis_prompt_parts(
+                        chapter_range=range_str,
+                        total_words=total_words,
+                        chapters_content=content_str,
+                    )
+                elif dim == "rhythm":
+                    prompts[dim] = self.prompt_manager.generate_rhythm_analysis_prompt_parts(
+                        chapter_range=range_str,
+                        total_words=total_words,
+                        chapters_content=content_str,
+                    )
+                elif dim == "conflict":
+                    prompts[dim] = self.prompt_manager.generate_conflict_analysis_prompt_parts(
+                        chapter_range=range_str,
+                        total_words=total_words,
+                        chapters_content=content_str,
+                    )
+                else:  # character
+                    prompts[dim] = self.prompt_manager.generate_character_check_prompt_parts(
+                        character_name=character_name,
+                        character_profile=self._get_character_profile(
+                            session, novel_id, character_name
+                        ),
+                        chapters_content=content_str,
+                    )
+        if "opening" in dims:
+            prompts["opening"] = self._build_opening_prompt(session, novel_id)
+
+        # 并行执行各维度 LLM 调用（提示词已构建完毕，不再访问 session）
+        results: Dict[str, Dict[str, Any]] = {}
+        if len(prompts) == 1:
+            dim, prompt = next(iter(prompts.items()))
+            results[dim] = self._call_analysis(prompt)
+        else:
+            with ThreadPoolExecutor(max_workers=len(prompts)) as executor:
+                future_map = {
+                    executor.submit(self._call_analysis, prompt): dim
+                    for dim, prompt in prompts.items()
+                }
+                for future in as_completed(future_map):
+                    results[future_map[future]] = future.result()
+
+        for dim, res in results.items():
+            res["novel_id"] = novel_id
+            if dim == "character":
+                res["character_name"] = character_name
+
+        return {
+            "novel_id": novel_id,
+            "dimensions": dims,
+            "results": results,
+        }
@@ -6,10 +6,10 @@
 """
 from __future__ import annotations
 
-import re
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any, Optional
 
 from loguru import logger
@@ -17,7 +17,7 @@ from sqlalchemy.orm import Session
 
 from ainovel.db.crud import novel_crud, chapter_crud
 from ainovel.db.database import get_database
-from ainovel.db.novel import WorkflowStatus
+from ainovel.db.novel import Novel, WorkflowStatus
 from ainovel.exceptions import NovelNotFoundError, InsufficientDataError
 
 
@@ -25,9 +25,9 @@ from ainovel.exceptions import NovelNotFoundError, InsufficientDataError
 PIPELINE_STEPS = (3, 4, 5)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TaskResult:
-    """单章节任务执行结果"""
+    """单章节任务执行结果（创建后只读；槽位化降低批量运行时的单实例内存）"""
 
     chapter_id: int
     chapter_title: str
@@ -37,7 +37,7 @@ class TaskResult:
     stats: dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class PipelineResult:
     """整体流水线执行结果"""
 
@@ -88,33 +88,42 @@ def parse_chapter_range(chapter_range: Optional[str], total: int) -> list[int]:
     - "1-10"     → 第1到10章
     - "1,3,5"    → 第1、3、5章
     """
+    return list(_expand_chapter_range(chapter_range or None, total))
+
+
+@lru_cache(maxsize=256)
+def _expand_chapter_range(chapter_range: Optional[str], total: int) -> tuple[int, ...]:
+    """
+    范围展开的纯函数实现，按 (范围串, 章节总数) 记忆化。
+
+    批量跑库场景下同一计划（如 from_step=3, to_step=5, range="1-10"）
+    会对几十部小说重复执行，展开结果只取决于这两个入参，命中后
+    免去逐段正则匹配与去重扫描；解析失败抛 ValueError，不入缓存
+    """
     if not chapter_range:
-        return list(range(1, total + 1))
+        return tuple(range(1, total + 1))
 
     indices: list[int] = []
     for part in chapter_range.split(","):
         part = part.strip()
-        if "-" in part:
-            m = re.fullmatch(r"(\d+)-(\d+)", part)
-            if not m:
+        # 纯数字文法用 partition + isdecimal 手写判定即可，
+        # 不必为每段进一次正则引擎
+        lo, sep, hi = part.partition("-")
+        if sep:
+            if not (lo.isdecimal() and hi.isdecimal()):
                 raise ValueError(f"无效章节范围格式: '{part}'，应为 'N-M'")
-            start, end = int(m.group(1)), int(m.group(2))
+            start, end = int(lo), int(hi)
             if start > end:
                 raise ValueError(f"章节范围起始 {start} 大于结束 {end}")
             indices.extend(range(start, end + 1))
-        elif re.fullmatch(r"\d+", part):
+        elif part.isdecimal():
             indices.append(int(part))
         else:
             raise ValueError(f"无效章节范围格式: '{part}'")
 
-    # 去重并过滤越界
-    seen: set[int] = set()
-    result: list[int] = []
-    for idx in indices:
-        if idx not in seen and 1 <= idx <= total:
-            seen.add(idx)
-            result.append(idx)
-    return sorted(result)
+    # 去重并过滤越界：结果横竖要排序，顺序交给 sorted 即可，
+    # 单个生成器表达式替代 seen/result 双簿记循环
+    return tuple(sorted(i for i in set(indices) if 1 <= i <= total))
 
 
 class PipelineRunner:
@@ -180,9 +189,12 @@ class PipelineRunner:
 
         # 步骤3：生成大纲（novel 级别，不按章节循环）
         if from_step <= 3 <= to_step:
-            self._run_step3(session, novel_id, novel, regenerate, result)
-            # 刷新 novel 对象，确保后续步骤能看到新生成的 volumes/chapters
-            session.refresh(novel)
+            generated = self._run_step3(session, novel_id, novel, regenerate, result)
+            if generated:
+                # 仅在步骤3实际生成后重读 novel（幂等跳过路径无需刷新）；
+                # populate_existing 的 get 连带 selectin 关系一并重载，
+                # 比无差别 session.refresh 少一轮逐属性刷新
+                novel = session.get(Novel, novel_id, populate_existing=True)
 
         # 步骤4/5：按章节批量执行
         if to_step >= 4:
@@ -235,10 +247,8 @@ class PipelineRunner:
     @staticmethod
     def _collect_chapters(novel: Any) -> list[Any]:
         """按卷序、章序收集所有章节"""
-        chapters: list[Any] = []
-        for volume in sorted(novel.volumes, key=lambda v: v.order):
-            chapters.extend(sorted(volume.chapters, key=lambda c: c.order))
-        return chapters
+        # 卷/章已由关系 order_by 在 SQL 层排好序，此处仅展平
+        return [chapter for volume in novel.volumes for chapter in volume.chapters]
 
     def _run_step3(
         self,
@@ -247,16 +257,21 @@ class PipelineRunner:
         novel: Any,
         regenerate: bool,
         result: PipelineResult,
-    ) -> None:
-        """执行步骤3：大纲生成（幂等保护）"""
+    ) -> bool:
+        """执行步骤3：大纲生成（幂等保护）
+
+        Returns:
+            实际执行了生成返回 True，幂等跳过返回 False
+        """
         already_done = novel.current_step >= 3 and len(novel.volumes) > 0
         if already_done and not regenerate:
             logger.info(f"novel_id={novel_id} 步骤3已完成，跳过（regenerate=False）")
-            return
+            return False
 
         try:
             self._orch.step_3_outline(session, novel_id)
             logger.info(f"novel_id={novel_id} 步骤3完成")
+            return True
         except Exception as exc:
             logger.error(f"novel_id={novel_id} 步骤3失败: {exc}")
             raise
@@ -271,8 +286,12 @@ class PipelineRunner:
         result: PipelineResult,
     ) -> None:
         """串行批量执行步骤4/5（原有逻辑，使用传入 session）"""
+        # 单条 IN 查询预取全部目标章节，循环内按 id 取映射，
+        # N 次逐章往返合并为 1 次
+        rows = chapter_crud.get_by_ids(session, [cid for cid, _ in chapter_infos])
+        chapter_by_id = {chapter.id: chapter for chapter in rows}
         for chapter_id, chapter_title in chapter_infos:
-            chapter = chapter_crud.get_by_id(session, chapter_id)
+            chapter = chapter_by_id.get(chapter_id)
             if chapter is None:
                 continue
 
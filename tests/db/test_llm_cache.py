@@ -0,0 +1,60 @@
+"""
+LLM 结果缓存单元测试
+
+测试缓存键计算与 LLMCacheEntry 的读写
+"""
+import pytest
+from ainovel.db import init_database
+from ainovel.cache import (
+    make_quality_check_key,
+    get_cached_response,
+    put_cached_response,
+)
+
+
+@pytest.fixture
+def db():
+    """创建内存数据库用于测试"""
+    database = init_database("sqlite:///:memory:", echo=False)
+    database.create_all_tables()
+    yield database
+
+
+@pytest.fixture
+def session(db):
+    """创建数据库会话"""
+    with db.session_scope() as sess:
+        yield sess
+
+
+def test_cache_key_stable_and_sensitive():
+    """相同输入键一致，任一输入变更键不同"""
+    chars = [{"name": "张三", "mbti": "INTJ"}]
+    key1 = make_quality_check_key("章节内容", chars, "前情")
+    key2 = make_quality_check_key("章节内容", chars, "前情")
+    assert key1 == key2
+    assert make_quality_check_key("章节内容改", chars, "前情") != key1
+    assert make_quality_check_key("章节内容", chars, "前情改") != key1
+    assert make_quality_check_key("章节内容", [], "前情") != key1
+
+
+def test_put_get_roundtrip(session):
+    """写入后可读回，未写入的键返回 None"""
+    key = make_quality_check_key("内容", [], "无前情")
+    assert get_cached_response(session, key) is None
+
+    report = {"overall_score": 85, "issues": [{"severity": "minor", "description": "节奏稍慢"}]}
+    put_cached_response(session, key, report)
+
+    cached = get_cached_response(session, key)
+    assert cached == report
+
+
+def test_put_overwrites_existing(session):
+    """重复写入同一键时覆盖旧值"""
+    key = make_quality_check_key("内容2", [], "无前情")
+    put_cached_response(session, key, {"overall_score": 60, "issues": []})
+    put_cached_response(session, key, {"overall_score": 90, "issues": []})
+
+    cached = get_cached_response(session, key)
+    assert cached["overall_score"] == 90
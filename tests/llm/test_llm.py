@@ -84,6 +84,32 @@ class TestOpenAIClient:
         assert result["usage"]["output_tokens"] == 20
         assert result["cost"] > 0
 
+    @patch("ainovel.llm.openai_client.OpenAI")
+    def test_generate_stream_no_replay_on_mid_stream_rate_limit(self, mock_openai):
+        """流中途限流不整体重试：已推送的增量不重放，异常直接上抛"""
+        def make_chunk(text):
+            choice = Mock(delta=Mock(content=text), finish_reason=None)
+            return Mock(choices=[choice], usage=None, model="gpt-4o-mini")
+
+        def stream_iter():
+            yield make_chunk("第一段")
+            raise Exception("rate_limit exceeded")
+
+        mock_client = Mock()
+        mock_client.chat.completions.create.return_value = stream_iter()
+        mock_openai.return_value = mock_client
+
+        client = OpenAIClient(api_key="test_key")
+        received = []
+        with pytest.raises(RateLimitError):
+            client.generate_stream(
+                [{"role": "user", "content": "你好"}], on_delta=received.append
+            )
+
+        # 无重试重放：增量只推送一次，流也只建立一次
+        assert received == ["第一段"]
+        assert mock_client.chat.completions.create.call_count == 1
+
     def test_count_tokens(self):
         """测试Token计数"""
         client = OpenAIClient(api_key="test_key")
@@ -275,5 +275,153 @@ class TestWorkflowOrchestrator:
         assert test_novel.planning_content == planning_json
 
 
+    def test_analyze_multi(self, db_session, test_novel, orchestrator, mock_llm_client):
+        """测试多维度批量分析：共享章节读取，每个维度一次LLM调用"""
+        volume = volume_crud.create(
+            db_session,
+            novel_id=test_novel.id,
+            title="第一卷",
+            order=1,
+        )
+        for i in range(1, 3):
+            chapter = chapter_crud.create(
+                db_session,
+                volume_id=volume.id,
+                title=f"第{i}章",
+                order=i,
+                content=f"第{i}章正文内容" * 20,
+            )
+        db_session.commit()
+
+        mock_llm_client.generate.return_value = {
+            "content": '```json\n{"score": 80}\n```',
+            "usage": {"input_tokens": 100, "output_tokens": 50},
+            "cost": 0.01,
+        }
+
+        result = orchestrator.analyze_multi(
+            db_session, test_novel.id, ["satisfaction", "rhythm"]
+        )
+
+        assert result["novel_id"] == test_novel.id
+        assert set(result["results"].keys()) == {"satisfaction", "rhythm"}
+        assert result["results"]["satisfaction"]["score"] == 80
+        assert mock_llm_client.generate.call_count == 2
+
+    def test_analyze_multi_invalid_dimension(self, db_session, test_novel, orchestrator):
+        """测试多维度批量分析：非法维度报错"""
+        with pytest.raises(ValueError):
+            orchestrator.analyze_multi(db_session, test_novel.id, ["unknown"])
+
+    def test_analyze_multi_character_requires_name(self, db_session, test_novel, orchestrator):
+        """测试多维度批量分析：character 维度缺少角色名报错"""
+        with pytest.raises(ValueError):
+            orchestrator.analyze_multi(db_session, test_novel.id, ["character"])
+
+
+class TestBatchWebDeployment:
+    """Web 部署形态的批量路径：库实例只经 web 依赖层创建，不调用 init_database()"""
+
+    @pytest.fixture
+    def web_db(self, monkeypatch):
+        """模拟 Web 部署建库：工作线程须能经 db 层 get_database() 取到同一实例"""
+        import ainovel.db.database as db_database
+        import ainovel.web.dependencies as deps
+        from ainovel.db.base import Base
+        from ainovel.db.novel import Novel
+        from ainovel.db.volume import Volume
+        from ainovel.db.chapter import Chapter
+        from ainovel.memory.character import Character
+        from ainovel.memory.world_data import WorldData
+
+        monkeypatch.setattr(db_database, "_db_instance", None)
+        monkeypatch.setattr(deps, "_db_instance", None)
+        monkeypatch.setattr(deps.settings, "DATABASE_URL", "sqlite:///:memory:")
+
+        db = deps.get_database()
+        Base.metadata.create_all(db.engine)
+        return db
+
+    def test_step4_batch_concurrent_without_cli_init(self, web_db, mock_llm_client):
+        """并发批量细纲在 Web 部署下逐章成功，而非逐章报「数据库未初始化」"""
+        with web_db.session_scope() as session:
+            novel = novel_crud.create(
+                session,
+                title="Web批量测试",
+                description="测试用",
+                author="测试",
+            )
+            volume = volume_crud.create(
+                session, novel_id=novel.id, title="第一卷", order=1
+            )
+            for i in range(1, 4):
+                chapter_crud.create(
+                    session,
+                    volume_id=volume.id,
+                    title=f"第{i}章",
+                    order=i,
+                    content="",
+                )
+            session.commit()
+            novel_id = novel.id
+
+        mock_llm_client.generate.return_value = {
+            "content": '```json\n{"scenes": [{"scene_number": 1, "description": "测试场景"}]}\n```',
+            "usage": {"input_tokens": 100, "output_tokens": 100},
+            "cost": 0.01,
+        }
+
+        with web_db.session_scope() as session:
+            orchestrator = WorkflowOrchestrator(
+                mock_llm_client, CharacterDatabase(session), WorldDatabase(session)
+            )
+            result = orchestrator.step_4_batch_detail_outline(
+                session, novel_id, max_workers=2
+            )
+
+        assert result["total_chapters"] == 3
+        assert all(item["success"] for item in result["results"]), result["results"]
+
+    def test_step6_batch_concurrent_without_cli_init(self, web_db, mock_llm_client):
+        """并发批量质检在 Web 部署下逐章成功，而非逐章报「数据库未初始化」"""
+        with web_db.session_scope() as session:
+            novel = novel_crud.create(
+                session,
+                title="Web质检测试",
+                description="测试用",
+                author="测试",
+            )
+            volume = volume_crud.create(
+                session, novel_id=novel.id, title="第一卷", order=1
+            )
+            for i in range(1, 4):
+                chapter_crud.create(
+                    session,
+                    volume_id=volume.id,
+                    title=f"第{i}章",
+                    order=i,
+                    content=f"第{i}章正文内容" * 20,
+                )
+            session.commit()
+            novel_id = novel.id
+
+        mock_llm_client.generate_stream.return_value = {
+            "content": '```json\n{"overall_score": 85, "issues": []}\n```',
+            "usage": {"input_tokens": 100, "output_tokens": 100},
+            "cost": 0.01,
+        }
+
+        with web_db.session_scope() as session:
+            orchestrator = WorkflowOrchestrator(
+                mock_llm_client, CharacterDatabase(session), WorldDatabase(session)
+            )
+            result = orchestrator.step_6_batch_quality_check(
+                session, novel_id, max_workers=2
+            )
+
+        assert result["total_chapters"] == 3
+        assert all(item["success"] for item in result["results"]), result["results"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])